@@ -1,17 +1,138 @@
 # adk_client.py
 
+import abc
 import os
 import json
 import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+class MicroBatcher:
+    """
+    Groups concurrent requests into batched calls.
+
+    Items submitted with the same key within `max_wait` seconds are sent to
+    `handler(key, items)` together, up to `max_batch_size` per call; a full
+    batch is dispatched immediately. At most `max_concurrency` batches run at
+    once. `handler` must return one result per item, in order. Must be used
+    from a single event loop.
+    """
+    def __init__(self, handler: Callable[[Hashable, List[Any]], Awaitable[List[Any]]],
+                 max_batch_size: int = 16, max_wait: float = 0.01, max_concurrency: int = 4):
+        self.handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks = set()
+        self.stats = {"items": 0, "batches": 0, "max_batch": 0}
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((item, future))
+        if len(pending) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(key, [])
+        for start in range(0, len(pending), self.max_batch_size):
+            task = asyncio.ensure_future(self._run_batch(key, pending[start:start + self.max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, key: Hashable, batch: List[Tuple[Any, asyncio.Future]]):
+        async with self._semaphore:
+            # Callers cancelled while the batch waited are not sent to the backend
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                return
+            self.stats["items"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+            try:
+                results = await self.handler(key, [item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Batch handler returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            finally:
+                # Batch cancelled (e.g. loop shutdown): never leave a submitter waiting
+                for _, future in batch:
+                    if not future.done():
+                        future.cancel()
+
+class GenerationBackend(abc.ABC):
+    """Generates text for a batch of prompts; subclass to plug in a real model."""
+    @abc.abstractmethod
+    async def generate_batch(self, prompts: List[str], max_tokens: int, temperature: float) -> List[str]:
+        """Return one completion per prompt, in order."""
+
+class StubBackend(GenerationBackend):
+    """
+    Local stand-in for tests and benchmarks: each batch costs one fixed
+    round-trip plus a small per-prompt cost, like a batched model endpoint.
+    """
+    def __init__(self, batch_latency: float = 0.2, per_prompt_latency: float = 0.005):
+        self.batch_latency = batch_latency
+        self.per_prompt_latency = per_prompt_latency
+        self.calls = 0
+
+    async def generate_batch(self, prompts: List[str], max_tokens: int, temperature: float) -> List[str]:
+        self.calls += 1
+        await asyncio.sleep(self.batch_latency + self.per_prompt_latency * len(prompts))
+        return [stub_summary(p, max_tokens) for p in prompts]
+
+class CallableBackend(GenerationBackend):
+    """
+    Adapts a one-prompt function `fn(prompt, max_tokens, temperature)` (sync
+    or async) to the batch interface; sync functions run in worker threads.
+    A batch costs as long as its slowest prompt instead of their sum.
+    """
+    def __init__(self, fn: Callable[..., Any]):
+        self.fn = fn
+
+    async def generate_batch(self, prompts: List[str], max_tokens: int, temperature: float) -> List[str]:
+        if asyncio.iscoroutinefunction(self.fn):
+            calls = [self.fn(p, max_tokens, temperature) for p in prompts]
+        else:
+            calls = [asyncio.to_thread(self.fn, p, max_tokens, temperature) for p in prompts]
+        return list(await asyncio.gather(*calls))
+
+def stub_summary(prompt: str, max_tokens: int) -> str:
+    # crude stub: return first 300 chars of prompt as "summary"
+    return "LLM_STUB_SUMMARY: " + (prompt[:max_tokens*2].replace("\n", " "))[:500]
 
 class ADKLLMClient:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, backend: Optional[GenerationBackend] = None,
+                 max_batch_size: int = 16, max_wait: float = 0.01, max_concurrency: int = 4):
         self.api_key = api_key or os.environ.get("LLM_API_KEY")
         # TODO: Initialize the real ADK LLM client here.
         # Example (pseudocode):
         # from google_adk import LLMClient
         # self.client = LLMClient(api_key=self.api_key)
         self.client = None
+        # Used by agenerate; swap in a real backend once the ADK client exists
+        self.backend = backend or StubBackend()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_concurrency = max_concurrency
+        self._batcher: Optional[MicroBatcher] = None
+        self._batcher_loop = None
 
     def generate(self, prompt: str, max_tokens: int = 256, temperature: float = 0.0) -> str:
         """
@@ -25,13 +146,73 @@ class ADKLLMClient:
         # For POC/testing without ADK, return a trivial echo or summary stub.
         # WARNING: This is only for offline testing; replace with ADK.
         time.sleep(0.2)  # simulate latency
-        # crude stub: return first 300 chars of prompt as "summary"
-        return "LLM_STUB_SUMMARY: " + (prompt[:max_tokens*2].replace("\n", " "))[:500]
+        return stub_summary(prompt, max_tokens)
+
+    def _get_batcher(self) -> MicroBatcher:
+        # One batcher per event loop: its futures and timers belong to that loop
+        loop = asyncio.get_running_loop()
+        if self._batcher is None or self._batcher_loop is not loop:
+            self._batcher = MicroBatcher(self._generate_batch, self.max_batch_size,
+                                         self.max_wait, self.max_concurrency)
+            self._batcher_loop = loop
+        return self._batcher
+
+    async def _generate_batch(self, key: Tuple[int, float], prompts: List[str]) -> List[str]:
+        max_tokens, temperature = key
+        return await self.backend.generate_batch(prompts, max_tokens, temperature)
+
+    async def agenerate(self, prompt: str, max_tokens: int = 256, temperature: float = 0.0) -> str:
+        """
+        Non-blocking generate. Concurrent calls with the same settings that
+        arrive within `max_wait` seconds share one backend batch.
+        """
+        return await self._get_batcher().submit((max_tokens, temperature), prompt)
+
+    async def agenerate_many(self, prompts: List[str], max_tokens: int = 256,
+                             temperature: float = 0.0) -> List[str]:
+        return list(await asyncio.gather(*(self.agenerate(p, max_tokens, temperature) for p in prompts)))
+
+class MCPBackend(abc.ABC):
+    """Runs a batch of queries against one MCP tool; subclass to plug in a real toolset."""
+    @abc.abstractmethod
+    async def query_batch(self, name: str, queries: List[str]) -> List[dict]:
+        """Return one tool result per query, in order."""
+
+class StubMCPBackend(MCPBackend):
+    def __init__(self, batch_latency: float = 0.0):
+        self.batch_latency = batch_latency
+        self.calls = 0
+
+    async def query_batch(self, name: str, queries: List[str]) -> List[dict]:
+        self.calls += 1
+        if self.batch_latency:
+            await asyncio.sleep(self.batch_latency)
+        return [{"source": name, "result": f"mcp_stub_response for {q}"} for q in queries]
 
 class MCPClient:
-    def __init__(self, mcp_url=None):
+    def __init__(self, mcp_url=None, backend: Optional[MCPBackend] = None,
+                 max_batch_size: int = 16, max_wait: float = 0.01, max_concurrency: int = 4):
         self.mcp_url = mcp_url or os.environ.get("MCP_URL")
         # TODO: initialize MCP client if you use MCP. ADK provides McpToolset or similar.
+        self.backend = backend or StubMCPBackend()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_concurrency = max_concurrency
+        self._batcher: Optional[MicroBatcher] = None
+        self._batcher_loop = None
+
     def query(self, name: str, query: str):
         # TODO: use MCP toolset to call remote tools. This is a stub.
         return {"source": name, "result": f"mcp_stub_response for {query}"}
+
+    def _get_batcher(self) -> MicroBatcher:
+        loop = asyncio.get_running_loop()
+        if self._batcher is None or self._batcher_loop is not loop:
+            self._batcher = MicroBatcher(self.backend.query_batch, self.max_batch_size,
+                                         self.max_wait, self.max_concurrency)
+            self._batcher_loop = loop
+        return self._batcher
+
+    async def aquery(self, name: str, query: str) -> dict:
+        """Non-blocking query; concurrent queries to the same tool are batched."""
+        return await self._get_batcher().submit(name, query)
@@ -0,0 +1,43 @@
+# batch_main.py
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import asyncio
+from my_agents.research_agent import ResearchOrchestrator
+from my_agents.batch_runner import BatchResearchRunner
+from my_agents.research_corpus import ResearchCorpus
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run research for every topic in a JSONL file.")
+    parser.add_argument("input", help="JSONL file with one {\"topic\": ..., \"id\": ...} per line")
+    parser.add_argument("output", help="JSONL file results are appended to (reruns resume from it)")
+    parser.add_argument("--max-results", type=int, default=3, help="Sources per topic")
+    parser.add_argument("--topic-concurrency", type=int, default=8, help="Topics researched at once")
+    parser.add_argument("--llm-concurrency", type=int, default=16, help="Global cap on concurrent model calls")
+    parser.add_argument("--fetch-concurrency", type=int, default=32, help="Global cap on concurrent page fetches")
+    parser.add_argument("--summarize-mode", choices=["truncate", "map_reduce"], default="truncate")
+    parser.add_argument("--corpus", help="SQLite research corpus to store results in and reuse them from")
+    parser.add_argument("--corpus-mode", choices=["record", "seed", "answer"], default="record")
+    parser.add_argument("--corpus-max-age", type=float, default=7 * 24 * 3600, help="Corpus freshness (s)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    orchestrator = ResearchOrchestrator(
+        summarize_mode=args.summarize_mode,
+        corpus=ResearchCorpus(args.corpus) if args.corpus else None,
+        corpus_mode=args.corpus_mode,
+        corpus_max_age=args.corpus_max_age,
+    )
+    runner = BatchResearchRunner(
+        orchestrator,
+        topic_concurrency=args.topic_concurrency,
+        llm_concurrency=args.llm_concurrency,
+        fetch_concurrency=args.fetch_concurrency,
+        max_results=args.max_results,
+    )
+    stats = asyncio.run(runner.run(args.input, args.output))
+    print(f"Throughput: {stats['topics_per_minute']:.2f} topics/minute "
+          f"({stats['ok']} ok, {stats['empty']} without results, {stats['error']} failed, "
+          f"{stats['skipped']} skipped)")
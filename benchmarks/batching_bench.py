@@ -0,0 +1,49 @@
+# benchmarks/batching_bench.py
+"""
+Throughput of ADKLLMClient.agenerate under micro-batching.
+
+Submits many small prompts at once (like chunk summaries) against the stub
+backend and reports prompts/second for each max batch size. Batch size 1
+is the unbatched baseline: one backend round-trip per prompt.
+
+Usage:
+    python -m benchmarks.batching_bench --prompts 256 --batch-sizes 1,4,16,64 --concurrency 4
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from adk_client import ADKLLMClient, StubBackend
+
+async def run_config(args: argparse.Namespace, batch_size: int) -> dict:
+    backend = StubBackend(batch_latency=args.batch_latency, per_prompt_latency=args.per_prompt_latency)
+    client = ADKLLMClient(backend=backend, max_batch_size=batch_size, max_wait=args.max_wait,
+                          max_concurrency=args.concurrency)
+    prompts = [f"Summarize part {i} of the document: " + "lorem ipsum " * 20 for i in range(args.prompts)]
+    start = time.perf_counter()
+    await client.agenerate_many(prompts)
+    wall = time.perf_counter() - start
+    return {"batch_size": batch_size, "wall": wall, "prompts_per_sec": args.prompts / wall,
+            "backend_calls": backend.calls}
+
+def parse_args() -> argparse.Namespace:
+    ints = lambda s: [int(x) for x in s.split(",") if x]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prompts", type=int, default=256)
+    parser.add_argument("--batch-sizes", type=ints, default=[1, 4, 16, 64])
+    parser.add_argument("--concurrency", type=int, default=4, help="Batches in flight at once")
+    parser.add_argument("--max-wait", type=float, default=0.01, help="Batching window (s)")
+    parser.add_argument("--batch-latency", type=float, default=0.2, help="Stub round-trip per batch (s)")
+    parser.add_argument("--per-prompt-latency", type=float, default=0.005, help="Stub cost per prompt (s)")
+    return parser.parse_args()
+
+async def main(args: argparse.Namespace) -> int:
+    print(f"{'batch':>5} {'wall s':>8} {'prompts/s':>10} {'calls':>6}")
+    for batch_size in args.batch_sizes:
+        r = await run_config(args, batch_size)
+        print(f"{r['batch_size']:>5} {r['wall']:>8.2f} {r['prompts_per_sec']:>10.1f} {r['backend_calls']:>6}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,83 @@
+# benchmarks/corpus_server.py
+import asyncio
+import random
+import threading
+from typing import List, Optional
+
+from aiohttp import web
+
+WORDS = ("agent tool model search fetch summary latency throughput context memory "
+         "pipeline research source compare token cache network python async event "
+         "loop session runner prompt result ranking quality evaluation data").split()
+
+def synthetic_page(doc_id: int, paragraphs: int) -> str:
+    """Deterministic HTML article with boilerplate around the main content."""
+    rng = random.Random(doc_id)
+    body = []
+    for _ in range(paragraphs):
+        sentences = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 18))).capitalize() + "."
+                     for _ in range(rng.randint(3, 6))]
+        body.append(f"<p>{' '.join(sentences)}</p>")
+    return (
+        f"<html><head><title>Document {doc_id}</title><script>var tracking = {doc_id};</script>"
+        "<style>body { font-family: sans-serif; }</style></head><body>"
+        "<nav><a href='/'>Home</a> <a href='/about'>About</a></nav>"
+        f"<article><h1>Document {doc_id}</h1>{''.join(body)}</article>"
+        "<footer>Synthetic corpus for benchmarks</footer></body></html>"
+    )
+
+class CorpusServer:
+    """
+    Serves a synthetic corpus at /doc/{id} from a background thread so the
+    benchmark's own event loop only measures the pipeline.
+    """
+    def __init__(self, documents: int = 50, paragraphs: int = 20,
+                 latency: float = 0.05, latency_jitter: float = 0.05, seed: int = 0):
+        self.pages = [synthetic_page(i, paragraphs) for i in range(documents)]
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.port: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        doc_id = int(request.match_info["doc_id"])
+        if doc_id >= len(self.pages):
+            raise web.HTTPNotFound()
+        self.requests += 1
+        await asyncio.sleep(self.latency + self.random.random() * self.latency_jitter)
+        return web.Response(text=self.pages[doc_id], content_type="text/html")
+
+    def urls(self, count: int, offset: int = 0) -> List[str]:
+        return [f"http://127.0.0.1:{self.port}/doc/{(offset + i) % len(self.pages)}" for i in range(count)]
+
+    def start(self) -> "CorpusServer":
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            app = web.Application()
+            app.router.add_get("/doc/{doc_id}", self._handle)
+            self._runner = web.AppRunner(app, access_log=None)
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, "127.0.0.1", 0)
+            self._loop.run_until_complete(site.start())
+            self.port = site._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="corpus-server", daemon=True)
+        self._thread.start()
+        ready.wait(timeout=10)
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
@@ -0,0 +1,101 @@
+# benchmarks/fake_llm.py
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from typing import Any, List, Optional
+
+from tools.fetch_tool import fetch_url_async
+from tools.text_chunker import estimate_tokens
+
+class FakeModelError(RuntimeError):
+    """Injected failure, stands in for a 429 from the real model (retried like one)."""
+    code = 429
+
+class FakeModel:
+    """
+    Offline stand-in for Gemini used by the benchmarks.
+
+    Each call sleeps for a sampled base latency (lognormal around
+    `median_latency`) plus prompt/output token time at the configured token
+    rates, and fails with probability `failure_rate`.
+    """
+    def __init__(self,
+                 median_latency: float = 0.3,
+                 latency_sigma: float = 0.4,
+                 prompt_tokens_per_sec: float = 20000.0,
+                 output_tokens_per_sec: float = 150.0,
+                 failure_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.median_latency = median_latency
+        self.latency_sigma = latency_sigma
+        self.prompt_tokens_per_sec = prompt_tokens_per_sec
+        self.output_tokens_per_sec = output_tokens_per_sec
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.failures = 0
+
+    def sample_latency(self, prompt: str, output: str) -> float:
+        base = self.median_latency * math.exp(self.random.gauss(0.0, self.latency_sigma))
+        prompt_time = estimate_tokens(prompt) / self.prompt_tokens_per_sec if self.prompt_tokens_per_sec else 0.0
+        output_time = estimate_tokens(output) / self.output_tokens_per_sec if self.output_tokens_per_sec else 0.0
+        return base + prompt_time + output_time
+
+    async def respond(self, prompt: str, output: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.sample_latency(prompt, output))
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            self.failures += 1
+            raise FakeModelError("injected model failure")
+        return output
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:8]
+
+def fake_search_output(message: str, corpus_urls: List[str]) -> str:
+    results = [
+        {"title": f"Document {i}", "link": url, "snippet": f"Synthetic document {i} for {message[:40]}"}
+        for i, url in enumerate(corpus_urls)
+    ]
+    return json.dumps(results)
+
+def fake_summary_output(message: str) -> str:
+    d = _digest(message)
+    return "\n".join(f"* Key point {n} ({d}): synthetic finding about the content." for n in range(1, 4))
+
+def fake_comparison_output(message: str) -> str:
+    rows = [
+        {"source": source, "summary": f"Synthetic summary {_digest(source)}",
+         "pros": ["Clear structure"], "cons": ["Limited depth"]}
+        for source in re.findall(r"^Source: (\S+)", message, flags=re.MULTILINE)
+    ]
+    return json.dumps(rows)
+
+def install_fake_model(orchestrator: Any, model: FakeModel, corpus_urls: List[str]):
+    """
+    Replace every agent's model call on `orchestrator` with `model`.
+    SearchAgent answers with `corpus_urls`; FetchAgent really fetches the page
+    (as the fetch_url_async tool would) and echoes it back.
+    """
+    async def search(message: str, user_id: str) -> str:
+        return await model.respond(message, fake_search_output(message, corpus_urls))
+
+    async def fetch(message: str, user_id: str) -> str:
+        url = message.rsplit(" ", 1)[-1]
+        result = await fetch_url_async(url)
+        content = result.get("content", "") if result.get("status") == "success" else ""
+        return await model.respond(message + content, content)
+
+    async def summarize(message: str, user_id: str) -> str:
+        return await model.respond(message, fake_summary_output(message))
+
+    async def compare(message: str, user_id: str) -> str:
+        return await model.respond(message, fake_comparison_output(message))
+
+    orchestrator.search_agent._run_model = search
+    orchestrator.fetch_agent._run_model = fetch
+    orchestrator.summarizer_agent._run_model = summarize
+    orchestrator.comparison_agent._run_model = compare
@@ -0,0 +1,169 @@
+# benchmarks/pipeline_bench.py
+"""
+Offline performance benchmark for ResearchOrchestrator.
+
+Runs the full pipeline against a fake model (benchmarks/fake_llm.py) and a
+local synthetic corpus (benchmarks/corpus_server.py), so no Gemini key or
+internet access is needed. Reports throughput, per-stage latency
+percentiles and peak Python memory for every (sources, concurrency) pair.
+
+Usage:
+    python -m benchmarks.pipeline_bench --sources 3,10 --concurrency 1,4,8 --topics 5
+    python -m benchmarks.pipeline_bench --json bench.json --baseline previous.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, Any, List
+
+# Measure fetch + extraction on every run instead of cache hits
+os.environ.setdefault("PAGE_CACHE_DISABLED", "1")
+
+from my_agents.research_agent import ResearchOrchestrator
+from my_agents.research_events import ResearchCompleted
+from observability.tracing import tracer
+from benchmarks.corpus_server import CorpusServer
+from benchmarks.fake_llm import FakeModel, install_fake_model
+from tools.resilience import ResilienceLayer, RetryPolicy, set_resilience
+
+STAGES = ("research.job", "research.search", "research.source", "research.fetch",
+          "research.summarize", "research.compare", "tool.fetch_page",
+          "agent.search_agent", "agent.fetch_agent", "agent.summarizer_agent", "agent.comparison_agent")
+
+async def run_config(args: argparse.Namespace, server: CorpusServer, sources: int, concurrency: int) -> Dict[str, Any]:
+    tracer.reset()
+    orchestrator = ResearchOrchestrator(
+        max_concurrency=concurrency,
+        fetch_mode=args.fetch_mode,
+        summarize_mode=args.summarize_mode,
+    )
+    model = FakeModel(
+        median_latency=args.llm_latency,
+        latency_sigma=args.llm_sigma,
+        output_tokens_per_sec=args.output_tps,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    install_fake_model(orchestrator, model, server.urls(sources))
+
+    summarized = 0
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    # SearchAgent prints its raw response; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for t in range(args.topics):
+            async for event in orchestrator.stream_research(f"benchmark topic {t}", max_results=sources):
+                if isinstance(event, ResearchCompleted):
+                    summarized += len(event.summaries)
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+
+    latency = tracer.latency_summary()
+    return {
+        "sources": sources,
+        "concurrency": concurrency,
+        "topics": args.topics,
+        "wall_seconds": round(wall, 3),
+        "topics_per_minute": round(args.topics / wall * 60, 2),
+        "sources_per_second": round(summarized / wall, 2),
+        "sources_summarized": summarized,
+        "model_calls": model.calls,
+        "model_failures": model.failures,
+        "retries": sum(v for k, v in tracer.counters().items() if k.startswith("retries_total")),
+        "peak_memory_mb": round(peak / (1024 * 1024), 2),
+        "stages": {name: latency[name] for name in STAGES if name in latency},
+    }
+
+def print_report(results: List[Dict[str, Any]]):
+    print(f"\n{'sources':>7} {'conc':>4} {'wall s':>8} {'topics/min':>10} {'src/s':>7} "
+          f"{'job p50':>8} {'job p95':>8} {'fetch p95':>9} {'sum p95':>8} {'peak MB':>8} {'fails':>5}")
+    for r in results:
+        stages = r["stages"]
+        job = stages.get("research.job", {})
+        print(f"{r['sources']:>7} {r['concurrency']:>4} {r['wall_seconds']:>8.2f} {r['topics_per_minute']:>10.1f} "
+              f"{r['sources_per_second']:>7.2f} {job.get('p50', 0):>8.3f} {job.get('p95', 0):>8.3f} "
+              f"{stages.get('research.fetch', {}).get('p95', 0):>9.3f} "
+              f"{stages.get('research.summarize', {}).get('p95', 0):>8.3f} "
+              f"{r['peak_memory_mb']:>8.2f} {r['model_failures']:>5}")
+
+def compare_to_baseline(results: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    """Return a message for every config whose p50 job latency regressed beyond `tolerance`."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["sources"], r["concurrency"]): r for r in json.load(f)}
+    regressions = []
+    for r in results:
+        old = baseline.get((r["sources"], r["concurrency"]))
+        if not old:
+            continue
+        old_p50 = old["stages"].get("research.job", {}).get("p50", 0)
+        new_p50 = r["stages"].get("research.job", {}).get("p50", 0)
+        if old_p50 and new_p50 > old_p50 * (1 + tolerance):
+            regressions.append(
+                f"sources={r['sources']} concurrency={r['concurrency']}: job p50 {old_p50:.3f}s -> {new_p50:.3f}s"
+            )
+    return regressions
+
+def parse_args() -> argparse.Namespace:
+    ints = lambda s: [int(x) for x in s.split(",") if x]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=ints, default=[3, 10], help="Comma-separated source counts")
+    parser.add_argument("--concurrency", type=ints, default=[1, 4, 8], help="Comma-separated concurrency limits")
+    parser.add_argument("--topics", type=int, default=3, help="Research runs per configuration")
+    parser.add_argument("--fetch-mode", choices=["direct", "agent"], default="direct")
+    parser.add_argument("--summarize-mode", choices=["truncate", "map_reduce"], default="truncate")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Median base model latency (s)")
+    parser.add_argument("--llm-sigma", type=float, default=0.4, help="Lognormal sigma of model latency")
+    parser.add_argument("--output-tps", type=float, default=150.0, help="Simulated output tokens/second")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Probability a model call fails")
+    parser.add_argument("--model-rate", type=float, default=0.0, help="Model calls/s limit (0 = unlimited)")
+    parser.add_argument("--host-rate", type=float, default=0.0, help="Fetches/s limit per host (0 = unlimited)")
+    parser.add_argument("--hedge", action="store_true", help="Hedge slow fetches after the p95 delay")
+    parser.add_argument("--http-latency", type=float, default=0.05, help="Corpus server latency (s)")
+    parser.add_argument("--paragraphs", type=int, default=20, help="Paragraphs per synthetic page")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Previous --json output to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p50 slowdown vs baseline")
+    return parser.parse_args()
+
+async def main(args: argparse.Namespace) -> int:
+    logging.getLogger().setLevel(logging.WARNING)
+    set_resilience(ResilienceLayer(
+        model_rate=args.model_rate, model_burst=max(1.0, args.model_rate),
+        host_rate=args.host_rate, host_burst=max(1.0, args.host_rate),
+        model_retry=RetryPolicy(attempts=3, base_delay=0.1, max_delay=1.0),
+        hedge_fetches=args.hedge,
+    ))
+    server = CorpusServer(documents=max(args.sources), paragraphs=args.paragraphs,
+                          latency=args.http_latency).start()
+    tracemalloc.start()
+    results = []
+    try:
+        for sources in args.sources:
+            for concurrency in args.concurrency:
+                results.append(await run_config(args, server, sources, concurrency))
+    finally:
+        tracemalloc.stop()
+        server.stop()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        for msg in regressions:
+            print(f"REGRESSION {msg}")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,116 @@
+# benchmarks/startup_bench.py
+"""
+Cold-start benchmark for the CLI entry points.
+
+Every measurement runs in a fresh interpreter, so nothing is cached in
+sys.modules. Reports the median over --runs of:
+  interpreter   `python -c pass`, the floor for everything else
+  import        `import my_agents.research_agent` (and the batch runner)
+  prompt        `python main.py` until "Enter topic:" is printed
+  agent_build   importing the ADK stack and building one agent's runner,
+                which the CLI now pays on first use instead of at startup
+and exits 1 when import or time-to-prompt exceed their budgets.
+
+Usage:
+    python -m benchmarks.startup_bench --runs 5 --import-budget 0.5 --prompt-budget 1.0
+    python -m benchmarks.startup_bench --top 15   # slowest modules from -X importtime
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, Any, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import my_agents.research_agent, my_agents.batch_runner"
+BUILD_SNIPPET = "from my_agents.worker_agents import SearchAgent; SearchAgent().ensure_runner()"
+
+def time_command(args: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(args, cwd=ROOT, check=True, stdin=subprocess.DEVNULL,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def time_to_prompt(prompt: bytes = b"Enter topic:", timeout: float = 60.0) -> float:
+    """Seconds from spawning `python main.py` until it prints the topic prompt."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-u", "main.py"], cwd=ROOT, stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        seen = b""
+        while prompt not in seen:
+            chunk = proc.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError("main.py exited before printing the prompt")
+            seen += chunk
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError("Timed out waiting for the prompt")
+        return time.perf_counter() - start
+    finally:
+        proc.kill()
+        proc.wait()
+
+def slowest_imports(snippet: str, top: int) -> List[Tuple[str, float]]:
+    """Modules with the largest cumulative import time, from `python -X importtime`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", snippet], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.replace("import time:", "").split("|")]
+        if len(parts) == 3 and parts[1].isdigit():
+            rows.append((parts[2], int(parts[1]) / 1e6))
+    return sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+
+def measure(runs: int, fn) -> Dict[str, float]:
+    samples = [fn() for _ in range(runs)]
+    return {"median": round(statistics.median(samples), 4), "min": round(min(samples), 4),
+            "max": round(max(samples), 4)}
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--import-budget", type=float, default=0.5, help="Max median import time (s)")
+    parser.add_argument("--prompt-budget", type=float, default=1.0, help="Max median time-to-prompt (s)")
+    parser.add_argument("--skip-build", action="store_true", help="Don't measure the ADK agent build")
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest imports")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    return parser.parse_args()
+
+def main(args: argparse.Namespace) -> int:
+    python = sys.executable
+    results: Dict[str, Any] = {
+        "interpreter": measure(args.runs, lambda: time_command([python, "-c", "pass"])),
+        "import": measure(args.runs, lambda: time_command([python, "-c", IMPORT_SNIPPET])),
+        "prompt": measure(args.runs, time_to_prompt),
+    }
+    if not args.skip_build:
+        results["agent_build"] = measure(args.runs, lambda: time_command([python, "-c", BUILD_SNIPPET]))
+
+    print(f"\n{'stage':<12} {'median s':>9} {'min s':>8} {'max s':>8}")
+    for stage, r in results.items():
+        print(f"{stage:<12} {r['median']:>9.3f} {r['min']:>8.3f} {r['max']:>8.3f}")
+
+    if args.top:
+        print(f"\nSlowest imports ({IMPORT_SNIPPET}):")
+        for module, seconds in slowest_imports(IMPORT_SNIPPET, args.top):
+            print(f"  {seconds:>7.3f}s  {module}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    failures = []
+    if results["import"]["median"] > args.import_budget:
+        failures.append(f"import {results['import']['median']:.3f}s > budget {args.import_budget:.3f}s")
+    if results["prompt"]["median"] > args.prompt_budget:
+        failures.append(f"time-to-prompt {results['prompt']['median']:.3f}s > budget {args.prompt_budget:.3f}s")
+    for msg in failures:
+        print(f"OVER BUDGET {msg}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
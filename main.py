@@ -4,12 +4,62 @@ load_dotenv()
 
 import os
 import asyncio
+import threading
 from my_agents.research_agent import ResearchOrchestrator
+from my_agents.response_cache import ResponseCache
+from my_agents.research_corpus import corpus_from_env
+from my_agents.research_events import (
+    SearchCompleted, SourceFetched, SourceSummarized, SourceFailed, SourceDeduplicated,
+    ComparisonReady, ResearchCompleted,
+)
+from observability.tracing import tracer
 
 # Sanity check: key loaded
 print("GOOGLE_API_KEY loaded:", bool(os.getenv("GOOGLE_API_KEY")))
 
+async def render_research(orchestrator: ResearchOrchestrator, topic: str):
+    """Print each pipeline event as soon as the orchestrator yields it."""
+    async for event in orchestrator.stream_research(topic):
+        if isinstance(event, SearchCompleted):
+            print(f"\n[search] {len(event.results)} result(s) in {event.elapsed:.2f}s")
+        elif isinstance(event, SourceFetched):
+            print(f"[{event.index+1}] fetched {event.source} ({event.chars} chars, {event.elapsed:.2f}s)")
+        elif isinstance(event, SourceSummarized):
+            print(f"\n[{event.index+1}] Summary of {event.source} ({event.elapsed:.2f}s):\n{event.summary}\n")
+        elif isinstance(event, SourceFailed):
+            print(f"[{event.index+1}] skipped {event.source}: {event.error}")
+        elif isinstance(event, SourceDeduplicated):
+            print(f"[{event.index+1}] {event.source} duplicates {event.duplicate_of}, not summarized")
+        elif isinstance(event, ComparisonReady):
+            print(f"[compare] comparison ready in {event.elapsed:.2f}s")
+        elif isinstance(event, ResearchCompleted):
+            print("\n=== Formatted Results ===\n")
+            print(event.output)
+            print(f"\n=== End ({event.elapsed:.2f}s) ===\n")
+
 if __name__ == "__main__":
+    # Opt-in memoization of agent responses: RESPONSE_CACHE=1 (memory) plus
+    # RESPONSE_CACHE_PATH=.cache/responses.sqlite for a persistent tier
+    response_cache = None
+    if os.getenv("RESPONSE_CACHE", "").lower() in ("1", "true", "yes"):
+        response_cache = ResponseCache(disk_path=os.getenv("RESPONSE_CACHE_PATH"))
+    # Cheap: agents import google.adk and build their runners on first use
+    # Opt-in persistent corpus: RESEARCH_CORPUS=1 or RESEARCH_CORPUS_PATH, with
+    # RESEARCH_CORPUS_MODE=record|seed|answer and RESEARCH_CORPUS_MAX_AGE (seconds)
+    orchestrator = ResearchOrchestrator(
+        response_cache=response_cache,
+        corpus=corpus_from_env(),
+        corpus_mode=os.getenv("RESEARCH_CORPUS_MODE", "record"),
+        corpus_max_age=float(os.getenv("RESEARCH_CORPUS_MAX_AGE", 7 * 24 * 3600)),
+    )
+    # Load the ADK stack for the first call while the user is still typing
+    threading.Thread(target=orchestrator.search_agent.ensure_runner, daemon=True).start()
     topic = input("Enter topic: ").strip() or "agentic AI"
-    orchestrator = ResearchOrchestrator()
-    asyncio.run(orchestrator.run_research(topic))
\ No newline at end of file
+    asyncio.run(render_research(orchestrator, topic))
+
+    # Optional exports: TRACE_EXPORT_PATH (spans as JSON lines), METRICS_EXPORT_PATH (Prometheus text)
+    if os.getenv("TRACE_EXPORT_PATH"):
+        tracer.export_jsonl(os.getenv("TRACE_EXPORT_PATH"))
+    if os.getenv("METRICS_EXPORT_PATH"):
+        with open(os.getenv("METRICS_EXPORT_PATH"), "w", encoding="utf-8") as f:
+            f.write(tracer.prometheus_text())
\ No newline at end of file
@@ -0,0 +1,158 @@
+# agents/batch_runner.py
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Any, List, Set
+
+from .research_agent import ResearchOrchestrator, DEFAULT_MEMO_SOURCES
+from .research_events import SourceFailed, ResearchCompleted
+from observability.logging_metrics import MetricsLogger
+from observability.tracing import tracer
+
+def load_topics(input_path: str) -> List[Dict[str, str]]:
+    """
+    Read topics from a JSONL file. Each line is either {"topic": "...", "id": "..."}
+    (id optional, defaults to the topic) or a bare JSON string.
+    """
+    topics: List[Dict[str, str]] = []
+    seen: Set[str] = set()
+    with open(input_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                record = {"topic": record}
+            topic = (record.get("topic") or "").strip()
+            if not topic:
+                continue
+            topic_id = str(record.get("id") or topic)
+            if topic_id in seen:
+                continue
+            seen.add(topic_id)
+            topics.append({"id": topic_id, "topic": topic})
+    return topics
+
+def load_completed_ids(output_path: str) -> Set[str]:
+    """
+    IDs already written successfully to the output. Torn or foreign lines are
+    ignored, and "error"/"empty" records are run again.
+    """
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and record.get("status") == "ok":
+                done.add(record.get("id"))
+    return done
+
+class BatchResearchRunner:
+    """
+    Runs research for many topics concurrently on one shared orchestrator.
+
+    Global semaphores cap model calls and page fetches across all topics, and
+    the orchestrator's source memo makes every URL be fetched and summarized
+    once even when several topics return it. Each result is appended to the
+    output JSONL as soon as its topic finishes, so a rerun after a crash skips
+    the topics that already completed. Topics that failed or produced no
+    summaries are written with status "error"/"empty" and run again.
+    """
+    def __init__(self,
+                 orchestrator: ResearchOrchestrator,
+                 topic_concurrency: int = 8,
+                 llm_concurrency: int = 16,
+                 fetch_concurrency: int = 32,
+                 max_results: int = 3,
+                 memo_sources: int = DEFAULT_MEMO_SOURCES):
+        self.orchestrator = orchestrator
+        self.topic_concurrency = max(1, topic_concurrency)
+        self.llm_concurrency = llm_concurrency
+        self.fetch_concurrency = fetch_concurrency
+        self.max_results = max_results
+        self.memo_sources = memo_sources
+        self.logger = MetricsLogger("BatchResearchRunner")
+
+    async def _research_topic(self, item: Dict[str, str]) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"id": item["id"], "topic": item["topic"]}
+        failed_sources: List[Dict[str, str]] = []
+        start = time.time()
+        try:
+            completed = None
+            async for event in self.orchestrator.stream_research(item["topic"], self.max_results):
+                if isinstance(event, SourceFailed):
+                    failed_sources.append({"source": event.source, "error": event.error})
+                elif isinstance(event, ResearchCompleted):
+                    completed = event
+            if completed is None:
+                raise RuntimeError("Research ended without a result")
+            record.update({
+                # No search results or no usable source: likely transient, retry on resume
+                "status": "ok" if completed.summaries else "empty",
+                "summaries": completed.summaries,
+                "comparison": completed.comparison,
+                "output": completed.output,
+            })
+        except Exception as e:
+            self.logger.log(f"Topic {item['id']!r} failed: {e}", "ERROR")
+            record.update({"status": "error", "error": str(e) or type(e).__name__})
+        record["failed_sources"] = failed_sources
+        record["elapsed"] = round(time.time() - start, 3)
+        return record
+
+    async def run(self, input_path: str, output_path: str) -> Dict[str, Any]:
+        topics = load_topics(input_path)
+        done = load_completed_ids(output_path)
+        pending = [t for t in topics if t["id"] not in done]
+        self.logger.log(
+            f"Batch: {len(topics)} topic(s), {len(done & {t['id'] for t in topics})} already done, "
+            f"{len(pending)} to run"
+        )
+
+        self.orchestrator.configure_limits(self.llm_concurrency, self.fetch_concurrency)
+        if self.orchestrator.source_memo is None:
+            self.orchestrator.enable_source_memo(max_sources=self.memo_sources)
+
+        semaphore = asyncio.Semaphore(self.topic_concurrency)
+        write_lock = asyncio.Lock()
+        counts = {"ok": 0, "empty": 0, "error": 0}
+        start = time.time()
+
+        out_dir = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(out_dir, exist_ok=True)
+        with open(output_path, "a", encoding="utf-8") as out:
+            async def worker(item: Dict[str, str]):
+                async with semaphore:
+                    record = await self._research_topic(item)
+                async with write_lock:
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                counts[record["status"]] += 1
+                finished = sum(counts.values())
+                self.logger.log(f"[{finished}/{len(pending)}] {item['id']!r}: {record['status']} in {record['elapsed']:.1f}s")
+
+            await asyncio.gather(*(worker(item) for item in pending))
+
+        elapsed = time.time() - start
+        stats = {
+            "topics": len(pending),
+            "ok": counts["ok"],
+            "empty": counts["empty"],
+            "error": counts["error"],
+            "skipped": len(topics) - len(pending),
+            "elapsed": round(elapsed, 2),
+            "topics_per_minute": round(len(pending) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            "source_memo": dict(self.orchestrator.source_memo.stats),
+            "latency": tracer.latency_summary(),
+        }
+        self.logger.log(
+            f"Batch finished: {stats['ok']} ok, {stats['empty']} without results, {stats['error']} failed in {stats['elapsed']:.1f}s "
+            f"({stats['topics_per_minute']:.2f} topics/minute); source memo {stats['source_memo']}"
+        )
+        return stats
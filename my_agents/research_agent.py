@@ -1,126 +1,590 @@
 # agents/research_agent.py
 import asyncio
 import time
-from typing import List, Dict
+import uuid
+from collections import deque
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, Set, Tuple, Union
 
-from .worker_agents import SearchAgent, FetchAgent, SummarizerAgent, ComparisonAgent
-from tools.fetch_tool import fetch_url  # Fallback if agent fetch fails
+from .worker_agents import (
+    SearchAgent, FetchAgent, SummarizerAgent, ComparisonAgent, shared_agent, SUMMARY_FALLBACK,
+)
+from .response_cache import ResponseCache
+from .research_corpus import ResearchCorpus
+from .single_flight import SingleFlight
+from .research_events import (
+    ResearchEvent, SearchCompleted, SourceFetched, SourceSummarized, SourceFailed,
+    SourceDeduplicated, ComparisonReady, ResearchCompleted,
+)
+from tools.dedup import NearDuplicateIndex, simhash
+from tools.page_cache import get_page_cache, normalize_url
 from observability.logging_metrics import MetricsLogger
+from observability.tracing import tracer
+
+FETCH_MODES = ("direct", "agent")
+SUMMARIZE_MODES = ("truncate", "map_reduce")
+CORPUS_MODES = ("record", "seed", "answer")
+# Summaries kept by enable_source_memo unless told otherwise
+DEFAULT_MEMO_SOURCES = 10_000
+
+class DuplicateSourceError(Exception):
+    """
+    A fetched source nearly duplicates one already in the run. Raised by the
+    duplicate checks and turned into a {"duplicate_of"} result by
+    _process_source.
+    """
+    def __init__(self, original: str):
+        super().__init__(f"Near-duplicate of {original}")
+        self.original = original
 
 class ResearchOrchestrator:
-    def __init__(self):
-        self.search_agent = SearchAgent()
-        self.fetch_agent = FetchAgent()
-        self.summarizer_agent = SummarizerAgent()
-        self.comparison_agent = ComparisonAgent()
+    def __init__(self, max_concurrency: int = 5, source_timeout: float = 90.0,
+                 fetch_mode: str = "direct", response_cache: Optional[ResponseCache] = None,
+                 summarize_mode: str = "truncate", max_chunks_per_source: int = 8,
+                 shared_agents: bool = True, dedup: bool = True, dedup_distance: int = 8,
+                 backfill_results: int = 0, comparison_group_size: int = 6,
+                 corpus: Optional[ResearchCorpus] = None, corpus_mode: str = "record",
+                 corpus_max_age: float = 7 * 24 * 3600):
+        """
+        Args:
+            max_concurrency: Maximum number of sources fetched/summarized at once.
+            source_timeout: Seconds allowed for one source's fetch + summary before
+                it is dropped from the run.
+            fetch_mode: "direct" fetches pages itself and extracts the main text
+                locally (no LLM call); "agent" routes the fetch through FetchAgent.
+            response_cache: Opt-in memoization of Search/Summarizer/Comparison
+                agent responses. FetchAgent is never cached (see PageCache).
+            summarize_mode: "truncate" sends the first 10K chars in one call;
+                "map_reduce" summarizes every chunk concurrently and merges them.
+            max_chunks_per_source: Chunk cap per source in map_reduce mode.
+            shared_agents: Reuse the process-wide agents (see shared_agent) instead
+                of building new ADK agents and runners for this orchestrator.
+                The response cache and call limits stay with the orchestrator
+                and are passed to the agents on every call.
+            dedup: Fingerprint each fetched page (SimHash) and skip summarizing
+                near-duplicates of a source already in the run; they are listed
+                as aliases of that source instead.
+            dedup_distance: Max differing SimHash bits (of 64) for a near-duplicate.
+            backfill_results: Extra search results to request so sources dropped
+                as duplicates are replaced by lower-ranked ones.
+            comparison_group_size: Sources per ComparisonAgent call. Larger runs
+                are compared in parallel groups whose rows are merged, so the
+                prompt size stays flat as max_results grows.
+            corpus: Persistent ResearchCorpus that stores search results, page
+                text, summaries and comparisons. Sources and search results
+                younger than `corpus_max_age` seconds are reused from it.
+            corpus_mode: "record" only stores and reuses exact matches (same
+                topic, same URL); "seed" also starts from the best BM25 matches
+                in the corpus and searches only for the remaining slots;
+                "answer" skips search entirely whenever the corpus has matches.
+            corpus_max_age: Freshness threshold for anything read from the corpus.
+        """
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"fetch_mode must be one of {FETCH_MODES}, got {fetch_mode!r}")
+        if summarize_mode not in SUMMARIZE_MODES:
+            raise ValueError(f"summarize_mode must be one of {SUMMARIZE_MODES}, got {summarize_mode!r}")
+        if corpus_mode not in CORPUS_MODES:
+            raise ValueError(f"corpus_mode must be one of {CORPUS_MODES}, got {corpus_mode!r}")
+        make_agent = shared_agent if shared_agents else (lambda cls: cls())
+        self.search_agent = make_agent(SearchAgent)
+        self.fetch_agent = make_agent(FetchAgent)
+        self.summarizer_agent = make_agent(SummarizerAgent)
+        self.comparison_agent = make_agent(ComparisonAgent)
+        self.response_cache = response_cache
         self.logger = MetricsLogger("ResearchOrchestrator")
+        self.max_concurrency = max(1, max_concurrency)
+        self.source_timeout = source_timeout
+        self.fetch_mode = fetch_mode
+        self.summarize_mode = summarize_mode
+        self.max_chunks_per_source = max_chunks_per_source
+        self.dedup = dedup
+        self.dedup_distance = dedup_distance
+        self.backfill_results = max(0, backfill_results)
+        self.comparison_group_size = max(1, comparison_group_size)
+        self.corpus = corpus
+        self.corpus_mode = corpus_mode
+        self.corpus_max_age = corpus_max_age
+        # Optional shared limits/memo, see configure_limits and enable_source_memo
+        self.call_limiter: Optional[asyncio.Semaphore] = None
+        self.fetch_limiter: Optional[asyncio.Semaphore] = None
+        self.source_memo: Optional[SingleFlight] = None
+        self.page_flight: Optional[SingleFlight] = None
 
-    async def run_research(self, topic: str, max_results: int = 3) -> str:
-        start_time = time.time()
-        self.logger.log(f">>> Running research for: {topic}")
-
-        user_id = "user_1"
-
-        # 1) Run the search agent
-        self.logger.log("Running search_agent...")
-        search_start = time.time()
-        search_results = await self.search_agent.run(topic, user_id)
-        search_duration = time.time() - search_start
-        self.logger.log(f"Search completed in {search_duration:.2f}s. Extracted {len(search_results)} search result(s).")
-
-        if not search_results:
-            self.logger.log("No search results found.")
-            return "No search results could be retrieved for the topic."
-
-        # 2) Fetch and summarize each result
-        summaries: List[Dict[str, str]] = []
-        for i, item in enumerate(search_results[:max_results]):
-            link = item.get("link")
-            if not link:
-                self.logger.log(f"  No link for item {i+1}, skipping.")
-                continue
+    def configure_limits(self, llm_concurrency: Optional[int] = None, fetch_concurrency: Optional[int] = None):
+        """
+        Cap concurrent model calls (across all agents) and page fetches for every
+        research run executed by this orchestrator, e.g. many topics at once.
+        """
+        self.call_limiter = asyncio.Semaphore(llm_concurrency) if llm_concurrency else None
+        self.fetch_limiter = asyncio.Semaphore(fetch_concurrency) if fetch_concurrency else None
+
+    def _agent_options(self) -> Dict[str, Any]:
+        """Per-call agent settings owned by this orchestrator (see BaseAgent._run)."""
+        return {"response_cache": self.response_cache, "call_limiter": self.call_limiter}
+
+    def enable_source_memo(self, max_sources: Optional[int] = DEFAULT_MEMO_SOURCES, keep_results: bool = True):
+        """
+        Fetch and summarize each URL (by normalized form) once across all runs on
+        this orchestrator; runs that hit a URL already done (or in flight) reuse
+        its summary. At most `max_sources` summaries are kept, least recently
+        used dropped first (None for no limit). With `keep_results=False` only
+        URLs currently in flight are shared. Every run still gets its own
+        SourceFetched events and checks reused sources for near-duplicates.
+        """
+        self.source_memo = SingleFlight(keep_results=keep_results, max_results=max_sources)
+        self.page_flight = SingleFlight()
+
+    async def _fetch_content(self, index: int, link: str, user_id: str) -> str:
+        """Return the text to summarize for one source, according to fetch_mode."""
+        # Imported on first fetch: pulls in aiohttp, readability and BeautifulSoup
+        from tools.fetch_tool import fetch_url_async, fetch_page_async
+        if self.fetch_mode == "direct":
+            result = await fetch_page_async(link)
+            if result.get("status") != "success":
+                raise RuntimeError(result.get("error_message", f"Failed to fetch {link}"))
+            if not result["content"].strip():
+                raise RuntimeError(f"No readable content extracted from {link}")
+            return result["content"]
 
-            self.logger.log(f"  Processing item {i+1} (source={link})...")
-
-            # Run fetch agent
-            fetch_start = time.time()
-            content = await self.fetch_agent.run(link, user_id)
-            fetch_duration = time.time() - fetch_start
-            self.logger.log(f"  Fetch took {fetch_duration:.2f}s")
-
-            if "Failed to fetch" in content or not content.strip():
-                self.logger.log(f"  Fetch failed, falling back to direct fetch.")
-                content = fetch_url(link)  # Fallback to direct function
-
-            # Summarize
-            sum_start = time.time()
-            summary_text = await self.summarizer_agent.run(content, user_id)
-            sum_duration = time.time() - sum_start
-            self.logger.log(f"  Summarization took {sum_duration:.2f}s")
-            summaries.append({"source": link, "summary": summary_text})
-
-        if not summaries:
-            self.logger.log("No summaries generated.")
-            return "No valid sources to compare."
-
-        # 3) Compare
-        self.logger.log("Creating comparison table...")
-        compare_start = time.time()
-        compare_input = "Compare these sources:\n\n"
-        for s in summaries:
-            compare_input += f"Source: {s['source']}\nSummary: {s['summary']}\n\n"
-
-        comp_text = await self.comparison_agent.run(compare_input, user_id)
-        compare_duration = time.time() - compare_start
-        self.logger.log(f"Comparison took {compare_duration:.2f}s")
-
-        total_duration = time.time() - start_time
-        self.logger.log(f"Total research completed in {total_duration:.2f}s")
-
-        # Pretty-print results in a human-friendly layout per user request
-        def _parse_table_row_for_source(table_text: str, source: str):
-            # Find a markdown table row that contains the source URL
-            if not table_text:
-                return None
-            lines = [ln.strip() for ln in table_text.splitlines() if ln.strip()]
-            for ln in lines:
-                if ln.startswith("|") and source in ln:
-                    # Split into columns ignoring leading/trailing pipe
-                    cols = [c.strip() for c in ln.strip().strip("|").split("|")]
-                    # Expecting: Source, Summary, Pros, Cons
-                    if len(cols) >= 4:
-                        return {
-                            "source": cols[0],
-                            "summary": cols[1],
-                            "pros": cols[2].replace("<br>", "\n"),
-                            "cons": cols[3].replace("<br>", "\n"),
-                        }
+        # Run fetch agent
+        content = await self.fetch_agent.run(link, user_id, **self._agent_options())
+        if "Failed to fetch" in content or not content.strip():
+            self.logger.log(f"  [{index+1}] Fetch failed, falling back to direct fetch.")
+            result = await fetch_url_async(link)  # Fallback to direct pooled fetch
+            if result.get("status") != "success":
+                raise RuntimeError(result.get("error_message", f"Failed to fetch {link}"))
+            content = result["content"]
+        return content
+
+    async def _process_source(self, topic: str, index: int, link: str, user_id: str,
+                              emit: Callable[[ResearchEvent], None],
+                              dedup: Optional[NearDuplicateIndex] = None) -> Dict[str, Any]:
+        """
+        Fetch one search result and summarize it, emitting progress events.
+        A near-duplicate of an earlier source returns {"source", "duplicate_of"};
+        its SourceDeduplicated event is left to the job, which only emits it
+        once the original has been summarized.
+        """
+        with tracer.span("research.source", index=index, url=link) as span:
+            try:
+                result = await self._stored_source(index, link, dedup) if self.corpus is not None else None
+                if result is not None:
+                    span.set(corpus="hit")
+                elif self.source_memo is not None:
+                    result = self._memoized_source(index, link, dedup)
+                    if result is not None:
+                        span.set(memo="hit")
+                if result is None:
+                    result = await self._fetch_and_summarize(topic, index, link, user_id, emit, dedup)
+            except DuplicateSourceError as e:
+                span.set(duplicate_of=e.original)
+                self.logger.log(f"  [{index+1}] {link} is a near-duplicate of {e.original}, not summarizing")
+                return {"source": link, "duplicate_of": e.original}
+        emit(SourceSummarized(topic, index, link, result["summary"], span.duration))
+        return {"source": link, "summary": result["summary"]}
+
+    async def _stored_source(self, index: int, link: str,
+                             dedup: Optional[NearDuplicateIndex]) -> Optional[Dict[str, str]]:
+        """A fresh summary of `link` from the corpus, checked for duplicates like a fetched page."""
+        stored = await self.corpus.aget_source(link, self.corpus_max_age)
+        if stored is None:
+            return None
+        if dedup is not None and stored["text"]:
+            fingerprint = await asyncio.to_thread(simhash, stored["text"])
+            original = dedup.add(link, stored["text"], fingerprint, rank=index)
+            if original is not None:
+                raise DuplicateSourceError(original)
+        return {"source": link, "summary": stored["summary"]}
+
+    def _memoized_source(self, index: int, link: str, dedup: Optional[NearDuplicateIndex]) -> Optional[Dict[str, Any]]:
+        """A summary of `link` from an earlier run, checked against this run's sources."""
+        done = self.source_memo.get(normalize_url(link))
+        if done is None:
             return None
+        if dedup is not None and done["fingerprint"] is not None and done["chars"] >= dedup.min_chars:
+            original = dedup.add_fingerprint(link, done["fingerprint"], rank=index)
+            if original is not None:
+                raise DuplicateSourceError(original)
+        return done
+
+    async def _fetch_and_summarize(self, topic: str, index: int, link: str, user_id: str,
+                                   emit: Callable[[ResearchEvent], None],
+                                   dedup: Optional[NearDuplicateIndex] = None) -> Dict[str, Any]:
+        """
+        Fetch, duplicate-check and summarize one source. With the source memo
+        the fetch and the summary are shared with other runs on the same URL;
+        events and the duplicate check always stay with this run.
+        """
+        self.logger.log(f"  Processing item {index+1} (source={link})...")
+        key = normalize_url(link)
+        fetch_start = time.perf_counter()
+        if self.source_memo is not None:
+            page = await self.page_flight.do(key, lambda: self._fetch_page(index, link, user_id))
+        else:
+            page = await self._fetch_page(index, link, user_id)
+        emit(SourceFetched(topic, index, link, len(page["content"]), time.perf_counter() - fetch_start))
+
+        if dedup is not None:
+            # Check and insert happen without an await in between, so of two
+            # concurrent copies exactly one is kept
+            original = dedup.add(link, page["content"], page["fingerprint"], rank=index)
+            if original is not None:
+                raise DuplicateSourceError(original)
+
+        if self.source_memo is not None:
+            return await self.source_memo.do(key, lambda: self._summarize_page(index, link, user_id, page))
+        return await self._summarize_page(index, link, user_id, page)
+
+    async def _fetch_page(self, index: int, link: str, user_id: str) -> Dict[str, Any]:
+        """Fetch one page under the fetch limit; also fingerprints it when dedup is on."""
+        with tracer.span("research.fetch", mode=self.fetch_mode, url=link) as fetch_span:
+            if self.fetch_limiter is not None:
+                async with self.fetch_limiter:
+                    content = await self._fetch_content(index, link, user_id)
+            else:
+                content = await self._fetch_content(index, link, user_id)
+            fetch_span.set(chars=len(content))
+        self.logger.log(f"  [{index+1}] Fetch ({self.fetch_mode}) took {fetch_span.duration:.2f}s, {len(content)} chars")
+        fingerprint = await asyncio.to_thread(simhash, content) if self.dedup else None
+        return {"content": content, "fingerprint": fingerprint}
+
+    async def _summarize_page(self, index: int, link: str, user_id: str, page: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Summarize a fetched page and store it in the corpus. The result keeps
+        the page's fingerprint, so memo hits can still be duplicate-checked.
+        """
+        content = page["content"]
+        with tracer.span("research.summarize", mode=self.summarize_mode, url=link) as sum_span:
+            if self.summarize_mode == "map_reduce":
+                summary_text = await self.summarizer_agent.run_map_reduce(
+                    content, user_id, max_chunks=self.max_chunks_per_source, **self._agent_options()
+                )
+            else:
+                summary_text = await self.summarizer_agent.run(content, user_id, **self._agent_options())
+        self.logger.log(f"  [{index+1}] Summarization took {sum_span.duration:.2f}s")
+        if not summary_text or summary_text == SUMMARY_FALLBACK:
+            # Fails the source, so neither the source memo nor the corpus keeps it
+            raise RuntimeError(f"No usable summary for {link}")
+        if self.corpus is not None:
+            await self.corpus.arecord_source(link, content, summary_text)
+        return {"source": link, "summary": summary_text, "fingerprint": page["fingerprint"], "chars": len(content)}
+
+    async def _process_source_limited(self, topic: str, index: int, link: str, user_id: str,
+                                      semaphore: asyncio.Semaphore,
+                                      emit: Callable[[ResearchEvent], None],
+                                      dedup: Optional[NearDuplicateIndex] = None) -> Optional[Dict[str, Any]]:
+        """
+        Run one source under the concurrency limit and per-source timeout.
+        Failures only drop this source; they never cancel the rest of the batch.
+        """
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    self._process_source(topic, index, link, user_id, emit, dedup), timeout=self.source_timeout
+                )
+            except asyncio.TimeoutError:
+                error = f"Timed out after {self.source_timeout:.0f}s"
+                self.logger.log(f"  [{index+1}] {error}, dropping {link}", "WARNING")
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                self.logger.log(f"  [{index+1}] Failed to process {link}: {error}", "ERROR")
+            emit(SourceFailed(topic, index, link, error))
+            return None
+
+    async def stream_research(self, topic: str, max_results: int = 3,
+                              user_id: Optional[str] = None) -> AsyncIterator[ResearchEvent]:
+        """
+        Run the research pipeline and yield events as soon as each stage finishes:
+        SearchCompleted, then SourceFetched / SourceSummarized / SourceFailed per
+        source in completion order (SourceDeduplicated for near-duplicates,
+        after their original's SourceSummarized), then ComparisonReady, and
+        finally ResearchCompleted (always last).
+        Sources reused from the corpus or the source memo skip SourceFetched.
+
+        `user_id` identifies the caller in the agents' ADK sessions; when omitted
+        each run gets its own id so concurrent jobs never share session state.
+
+        The pipeline runs in its own task, so its spans never become current in
+        the consumer's context and the job's duration does not include the time
+        the consumer spends between events.
+        """
+        user_id = user_id or f"research_{uuid.uuid4().hex[:12]}"
+        queue: "asyncio.Queue[Union[ResearchEvent, asyncio.Task]]" = asyncio.Queue()
+        job = asyncio.create_task(self._research_job(topic, max_results, user_id, queue.put_nowait))
+        # The finished job itself is queued after all of its events
+        job.add_done_callback(queue.put_nowait)
+        try:
+            while True:
+                item = await queue.get()
+                if isinstance(item, asyncio.Task):
+                    # Re-raises a pipeline error in the consumer
+                    item.result()
+                    return
+                yield item
+        finally:
+            # Consumer stopped early (e.g. aclose()): stop the pipeline and its sources
+            job.cancel()
+
+    async def _research_job(self, topic: str, max_results: int, user_id: str,
+                            emit: Callable[[ResearchEvent], None]):
+        """The research pipeline behind stream_research; events go to `emit`."""
+        # Source tasks and agent calls started below are recorded as children of the job span
+        with tracer.span("research.job", topic=topic, user_id=user_id) as job_span:
+            self.logger.log(f">>> Running research for: {topic} (user_id={user_id})")
+
+            # 1) Run the search agent
+            self.logger.log("Running search_agent...")
+            with tracer.span("research.search") as search_span:
+                search_results, searched = await self._search(topic, user_id, max_results)
+                search_span.set(results=len(search_results))
+            self.logger.log(f"Search completed in {search_span.duration:.2f}s. Extracted {len(search_results)} search result(s).")
+            emit(SearchCompleted(topic, search_results, search_span.duration))
+
+            if not search_results:
+                self.logger.log("No search results found.")
+                emit(ResearchCompleted(topic, "No search results could be retrieved for the topic.",
+                                       elapsed=job_span.elapsed))
+                return
+
+            # 2) Fetch and summarize results concurrently; sources emit their own events
+            candidates = deque()
+            seen_urls = set()
+            for i, item in enumerate(search_results):
+                link = item.get("link")
+                if not link:
+                    self.logger.log(f"  No link for item {i+1}, skipping.")
+                    continue
+                if normalize_url(link) in seen_urls:
+                    self.logger.log(f"  Item {i+1} repeats an earlier URL, skipping.")
+                    continue
+                seen_urls.add(normalize_url(link))
+                candidates.append((i, link))
+                if len(candidates) >= max_results + self.backfill_results:
+                    break
+
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            dedup = NearDuplicateIndex(self.dedup_distance) if self.dedup else None
+            tasks: List[asyncio.Task] = []
+            links: Dict[asyncio.Task, Tuple[int, str]] = {}
+
+            def start_source(index: int, link: str) -> asyncio.Task:
+                task = asyncio.create_task(
+                    self._process_source_limited(topic, index, link, user_id, semaphore, emit, dedup)
+                )
+                tasks.append(task)
+                links[task] = (index, link)
+                return task
+
+            while candidates and len(tasks) < max_results:
+                start_source(*candidates.popleft())
+
+            sources_start = time.perf_counter()
+            # A duplicate is settled by its original: once that is summarized the
+            # duplicate is reported, if it fails the duplicate is retried instead
+            duplicates_of: Dict[str, List[asyncio.Task]] = {}
+            succeeded: Set[str] = set()
+            failed: Set[str] = set()
+            retried: Set[asyncio.Task] = set()
+
+            def settle(original: str):
+                for task in duplicates_of.pop(original, []):
+                    index, link = links[task]
+                    if original in succeeded:
+                        emit(SourceDeduplicated(topic, index, link, original))
+                    else:
+                        self.logger.log(f"  [{index+1}] {original} failed, retrying its duplicate {link}")
+                        retried.add(task)
+                        pending.add(start_source(index, link))
+
+            try:
+                # Recorded while the sources run; a failure here still cancels them below.
+                # Reused results are not recorded again, or their search time would
+                # be refreshed on every run and they would never expire.
+                topic_id = None
+                if self.corpus is not None and searched:
+                    topic_id = await self.corpus.arecord_search(topic, search_results)
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        result = task.result()
+                        link = links[task][1]
+                        if result is None:
+                            failed.add(link)
+                            if dedup is not None:
+                                dedup.discard(link)
+                            settle(link)
+                        elif "duplicate_of" in result:
+                            duplicates_of.setdefault(result["duplicate_of"], []).append(task)
+                            if result["duplicate_of"] in succeeded or result["duplicate_of"] in failed:
+                                settle(result["duplicate_of"])
+                            if candidates:
+                                # Backfill from lower-ranked results to keep max_results distinct sources
+                                pending.add(start_source(*candidates.popleft()))
+                        else:
+                            succeeded.add(link)
+                            settle(link)
+            finally:
+                # Cancelled or failed: don't leave sources running
+                for task in tasks:
+                    task.cancel()
+
+            # Results stay in search-rank order regardless of completion order
+            tasks = sorted((t for t in tasks if t not in retried), key=lambda t: links[t][0])
+            results = [t.result() for t in tasks if t.result() is not None]
+            summaries = _attribute_by_rank(results, {link: index for index, link in links.values()})
+            duplicates = len(results) - len(summaries)
+            tracer.inc("research_sources_total", len(summaries), status="ok")
+            tracer.inc("research_sources_total", duplicates, status="duplicate")
+            tracer.inc("research_sources_total", len(tasks) - len(summaries) - duplicates, status="failed")
+            self.logger.log(
+                f"Processed {len(summaries)}/{len(tasks)} source(s) in {time.perf_counter() - sources_start:.2f}s "
+                f"({duplicates} near-duplicate(s), concurrency={self.max_concurrency})"
+            )
+
+            if not summaries:
+                self.logger.log("No summaries generated.")
+                emit(ResearchCompleted(topic, "No valid sources to compare.", elapsed=job_span.elapsed))
+                return
+
+            # 3) Compare
+            self.logger.log("Creating comparison table...")
+            groups = -(-len(summaries) // self.comparison_group_size)
+            with tracer.span("research.compare", sources=len(summaries), groups=groups) as compare_span:
+                rows = await self._compare(summaries, user_id)
+                comp_text = _render_table(summaries, rows)
+            self.logger.log(f"Comparison took {compare_span.duration:.2f}s")
+            emit(ComparisonReady(topic, comp_text, compare_span.duration))
+            if topic_id is not None:
+                await self.corpus.arecord_comparison(topic_id, comp_text)
+
+            total_duration = job_span.elapsed
+            self.logger.log(f"Total research completed in {total_duration:.2f}s")
+            page_cache = get_page_cache()
+            if page_cache is not None:
+                self.logger.log(f"Page cache stats: {page_cache.stats()}")
+            if self.response_cache is not None:
+                self.logger.log(f"Response cache stats: {self.response_cache.stats()}")
+            if self.corpus is not None:
+                self.logger.log(f"Research corpus stats: {self.corpus.stats()}")
+
+            pretty = _pretty_print(summaries, rows)
+            emit(ResearchCompleted(topic, pretty, summaries, comp_text, total_duration))
+
+    async def _search(self, topic: str, user_id: str, max_results: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Search results for the topic: corpus matches first (seed/answer modes),
+        then a recent identical search from the corpus or a SearchAgent call
+        for whatever slots are left. Also returns whether SearchAgent ran; only
+        then are the results worth recording as a new search.
+        """
+        wanted = max_results + self.backfill_results
+        results: List[Dict[str, Any]] = []
+        if self.corpus is not None and self.corpus_mode != "record":
+            for match in await self.corpus.aretrieve(topic, wanted, self.corpus_max_age):
+                results.append({"title": match["title"], "link": match["url"],
+                                "snippet": match["snippet"], "from_corpus": True})
+            self.logger.log(f"Corpus returned {len(results)} indexed source(s) for the topic")
+            if results and (self.corpus_mode == "answer" or len(results) >= max_results):
+                return results, False
+
+        # Only search for the slots the corpus matches left open
+        remaining = wanted - len(results)
+        if self.corpus is not None:
+            stored = await self.corpus.aget_search(topic, self.corpus_max_age) or []
+            # Only what SearchAgent returned; earlier corpus matches are retrieved again above
+            stored = [item for item in stored if not item.get("from_corpus")]
+            if len(stored) >= remaining:
+                self.logger.log("Reusing recent search results from the corpus")
+                return results + stored, False
+        found = await self.search_agent.run(topic, user_id, num_results=remaining, **self._agent_options())
+        return results + found, True
+
+    async def _compare(self, summaries: List[Dict[str, Any]], user_id: str) -> Dict[str, Dict[str, str]]:
+        """
+        Compare sources in groups of `comparison_group_size`, all groups in
+        parallel, and merge their rows into one index keyed by normalized URL.
+        A failed group only loses the pros/cons of its own sources.
+        """
+        size = self.comparison_group_size
+        groups = [summaries[i:i + size] for i in range(0, len(summaries), size)]
+        results = await asyncio.gather(
+            *(self.comparison_agent.run(group, user_id, **self._agent_options()) for group in groups),
+            return_exceptions=True
+        )
+        rows: Dict[str, Dict[str, str]] = {}
+        for group, result in zip(groups, results):
+            if isinstance(result, Exception):
+                self.logger.log(f"  Comparison of {len(group)} source(s) failed: {result}", "ERROR")
+                continue
+            for row in result:
+                rows.setdefault(normalize_url(row["source"]), row)
+        return rows
+
+    async def run_research(self, topic: str, max_results: int = 3, user_id: Optional[str] = None) -> str:
+        completed: Optional[ResearchCompleted] = None
+        async for event in self.stream_research(topic, max_results, user_id):
+            if isinstance(event, ResearchCompleted):
+                completed = event
+
+        if completed.comparison:
+            print("\n=== Formatted Results ===\n")
+            print(completed.output)
+            print("\n=== End ===\n")
+
+        return completed.output
+
+def _table_cell(text: str) -> str:
+    return text.replace("|", "\\|").replace("\n", "<br>")
+
+def _attribute_by_rank(results: List[Dict[str, Any]], ranks: Dict[str, int]) -> List[Dict[str, Any]]:
+    """
+    Summaries in search-rank order with their near-duplicates as aliases. A
+    group's one summary is listed under its best-ranked URL, whichever copy
+    happened to be fetched first and summarized.
+    """
+    summaries = [dict(r) for r in results if "duplicate_of" not in r]
+    by_source = {s["source"]: s for s in summaries}
+    for r in results:
+        if "duplicate_of" in r and r["duplicate_of"] in by_source:
+            by_source[r["duplicate_of"]].setdefault("aliases", []).append(r["source"])
+    for s in summaries:
+        group = sorted([s["source"], *s.get("aliases", [])], key=ranks.__getitem__)
+        s["source"] = group[0]
+        if len(group) > 1:
+            s["aliases"] = group[1:]
+    return sorted(summaries, key=lambda s: ranks[s["source"]])
+
+def _render_table(summaries_list, rows):
+    """Markdown Source/Summary/Pros/Cons table in source order; sources without a row get N/A."""
+    lines = ["| Source | Summary | Pros | Cons |", "|--------|---------|------|------|"]
+    for s in summaries_list:
+        row = rows.get(normalize_url(s["source"]))
+        if row:
+            cells = (s["source"], row["summary"] or "N/A", row["pros"] or "N/A", row["cons"] or "N/A")
+        else:
+            cells = (s["source"], (s.get("summary") or "N/A")[:300], "N/A", "N/A")
+        lines.append("| " + " | ".join(_table_cell(c) for c in cells) + " |")
+    return "\n".join(lines)
 
-        def _pretty_print(summaries_list, table_text):
-            out_lines = []
-            for s in summaries_list:
-                src = s.get("source") or "Unknown source"
-                parsed = _parse_table_row_for_source(table_text, src)
-                out_lines.append(f"Source: {src}")
-                # Summary from parsed table if present, otherwise from summaries_list
-                if parsed and parsed.get("summary"):
-                    out_lines.append(f"Summary: {parsed.get('summary')}")
-                else:
-                    out_lines.append(f"Summary: {s.get('summary')[:1000] if s.get('summary') else 'N/A'}")
-                if parsed:
-                    out_lines.append(f"Pros: {parsed.get('pros') or 'N/A'}")
-                    out_lines.append(f"Cons: {parsed.get('cons') or 'N/A'}")
-                else:
-                    out_lines.append("Pros: N/A")
-                    out_lines.append("Cons: N/A")
-                out_lines.append("-" * 60)
-            return "\n".join(out_lines)
-
-        pretty = _pretty_print(summaries, comp_text)
-
-        print("\n=== Formatted Results ===\n")
-        print(pretty)
-        print("\n=== End ===\n")
-
-        return pretty
\ No newline at end of file
+# Pretty-print results in a human-friendly layout per user request
+def _pretty_print(summaries_list, rows):
+    out_lines = []
+    for s in summaries_list:
+        src = s.get("source") or "Unknown source"
+        parsed = rows.get(normalize_url(src)) if s.get("source") else None
+        out_lines.append(f"Source: {src}")
+        if s.get("aliases"):
+            out_lines.append(f"Also at: {', '.join(s['aliases'])}")
+        # Summary from the comparison row if present, otherwise from summaries_list
+        if parsed and parsed.get("summary"):
+            out_lines.append(f"Summary: {parsed.get('summary')}")
+        else:
+            out_lines.append(f"Summary: {s.get('summary')[:1000] if s.get('summary') else 'N/A'}")
+        if parsed:
+            out_lines.append(f"Pros: {parsed.get('pros') or 'N/A'}")
+            out_lines.append(f"Cons: {parsed.get('cons') or 'N/A'}")
+        else:
+            out_lines.append("Pros: N/A")
+            out_lines.append("Cons: N/A")
+        out_lines.append("-" * 60)
+    return "\n".join(out_lines)
@@ -0,0 +1,252 @@
+# agents/research_corpus.py
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from tools.page_cache import normalize_url
+
+DEFAULT_CORPUS_PATH = os.path.join(".cache", "corpus.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    snippet TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL DEFAULT '',
+    summary TEXT,
+    updated_at REAL NOT NULL,
+    summarized_at REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS sources_fts USING fts5(
+    title, snippet, summary, text,
+    content='sources', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS sources_ai AFTER INSERT ON sources BEGIN
+    INSERT INTO sources_fts(rowid, title, snippet, summary, text)
+    VALUES (new.id, new.title, new.snippet, COALESCE(new.summary, ''), new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS sources_ad AFTER DELETE ON sources BEGIN
+    INSERT INTO sources_fts(sources_fts, rowid, title, snippet, summary, text)
+    VALUES ('delete', old.id, old.title, old.snippet, COALESCE(old.summary, ''), old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS sources_au AFTER UPDATE ON sources BEGIN
+    INSERT INTO sources_fts(sources_fts, rowid, title, snippet, summary, text)
+    VALUES ('delete', old.id, old.title, old.snippet, COALESCE(old.summary, ''), old.text);
+    INSERT INTO sources_fts(rowid, title, snippet, summary, text)
+    VALUES (new.id, new.title, new.snippet, COALESCE(new.summary, ''), new.text);
+END;
+CREATE TABLE IF NOT EXISTS topics (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    results TEXT NOT NULL,
+    comparison TEXT,
+    searched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_topics_normalized ON topics(normalized, searched_at);
+CREATE TABLE IF NOT EXISTS topic_sources (
+    topic_id INTEGER NOT NULL REFERENCES topics(id) ON DELETE CASCADE,
+    source_id INTEGER NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (topic_id, source_id)
+);
+"""
+
+# Words that only add noise to a BM25 query
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is of on or the to vs what why with".split()
+)
+
+_WORD = re.compile(r"\w+")
+
+def normalize_topic(topic: str) -> str:
+    return " ".join(topic.lower().split())
+
+def query_terms(text: str) -> List[str]:
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        if word not in STOPWORDS and word not in terms:
+            terms.append(word)
+    return terms
+
+class ResearchCorpus:
+    """
+    Persistent store of everything a research run produces: search results
+    per topic, extracted page text and summaries per source, and the final
+    comparison. Sources are indexed with SQLite FTS5, so later runs can
+    retrieve the best-matching already-summarized sources (BM25 over title,
+    snippet, summary and text) instead of searching, fetching and
+    summarizing them again.
+
+    Freshness is decided by the caller: every lookup takes a `max_age` in
+    seconds and ignores entries older than that.
+    """
+    def __init__(self, path: str = DEFAULT_CORPUS_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"search_hits": 0, "source_hits": 0, "retrievals": 0, "retrieved": 0, "stores": 0}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counter: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[counter] += n
+
+    def record_search(self, topic: str, results: List[Dict[str, Any]]) -> int:
+        """Store a topic's search results and register their URLs as sources. Returns the topic id."""
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            topic_id = conn.execute(
+                "INSERT INTO topics (topic, normalized, results, searched_at) VALUES (?, ?, ?, ?)",
+                (topic, normalize_topic(topic), json.dumps(results, ensure_ascii=False), now),
+            ).lastrowid
+            for rank, item in enumerate(results):
+                if not item.get("link"):
+                    continue
+                conn.execute(
+                    "INSERT INTO sources (key, url, title, snippet, updated_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET title = excluded.title, snippet = excluded.snippet",
+                    (normalize_url(item["link"]), item["link"], item.get("title") or "",
+                     item.get("snippet") or "", now),
+                )
+                source_id = conn.execute("SELECT id FROM sources WHERE key = ?",
+                                         (normalize_url(item["link"]),)).fetchone()[0]
+                conn.execute("INSERT OR IGNORE INTO topic_sources (topic_id, source_id, rank) VALUES (?, ?, ?)",
+                             (topic_id, source_id, rank))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._count("stores")
+        return topic_id
+
+    def record_source(self, url: str, text: str, summary: str):
+        """Store a fetched page's text together with its summary."""
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO sources (key, url, text, summary, updated_at, summarized_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET text = excluded.text, summary = excluded.summary, "
+            "updated_at = excluded.updated_at, summarized_at = excluded.summarized_at",
+            (normalize_url(url), url, text, summary, now, now),
+        )
+        self._count("stores")
+
+    def record_comparison(self, topic_id: int, comparison: str):
+        self._conn().execute("UPDATE topics SET comparison = ? WHERE id = ?", (comparison, topic_id))
+
+    def get_search(self, topic: str, max_age: float) -> Optional[List[Dict[str, Any]]]:
+        """Search results recorded for the same topic within `max_age` seconds, newest first."""
+        row = self._conn().execute(
+            "SELECT results FROM topics WHERE normalized = ? AND searched_at >= ? "
+            "ORDER BY searched_at DESC LIMIT 1",
+            (normalize_topic(topic), time.time() - max_age),
+        ).fetchone()
+        if row is None:
+            return None
+        self._count("search_hits")
+        return json.loads(row["results"])
+
+    def get_source(self, url: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """A source summarized within `max_age` seconds, with its text and summary."""
+        row = self._conn().execute(
+            "SELECT url, title, text, summary, summarized_at FROM sources "
+            "WHERE key = ? AND summary IS NOT NULL AND summarized_at >= ?",
+            (normalize_url(url), time.time() - max_age),
+        ).fetchone()
+        if row is None:
+            return None
+        self._count("source_hits")
+        return dict(row)
+
+    def retrieve(self, query: str, limit: int, max_age: float,
+                 min_coverage: float = 0.6) -> List[Dict[str, Any]]:
+        """
+        Best BM25 matches for `query` among sources summarized within `max_age`.
+        A match must contain at least `min_coverage` of the query's terms, so
+        adjacent topics match but a single shared word does not.
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+        self._count("retrievals")
+        # Quote every term so user text can never be parsed as FTS5 syntax
+        match = " OR ".join('"{}"'.format(t.replace('"', '""')) for t in terms)
+        rows = self._conn().execute(
+            "SELECT s.url, s.title, s.snippet, s.text, s.summary, s.summarized_at, "
+            "bm25(sources_fts, 4.0, 2.0, 2.0, 1.0) AS score "
+            "FROM sources_fts JOIN sources s ON s.id = sources_fts.rowid "
+            "WHERE sources_fts MATCH ? AND s.summary IS NOT NULL AND s.summarized_at >= ? "
+            "ORDER BY score LIMIT ?",
+            (match, time.time() - max_age, limit * 4),
+        ).fetchall()
+
+        matches = []
+        for row in rows:
+            words = set(_WORD.findall(f"{row['title']} {row['snippet']} {row['summary']} {row['text']}".lower()))
+            coverage = sum(1 for t in terms if t in words) / len(terms)
+            if coverage >= min_coverage:
+                matches.append({**dict(row), "coverage": round(coverage, 3)})
+            if len(matches) >= limit:
+                break
+        self._count("retrieved", len(matches))
+        return matches
+
+    async def arecord_search(self, topic: str, results: List[Dict[str, Any]]) -> int:
+        return await asyncio.to_thread(self.record_search, topic, results)
+
+    async def arecord_source(self, url: str, text: str, summary: str):
+        await asyncio.to_thread(self.record_source, url, text, summary)
+
+    async def arecord_comparison(self, topic_id: int, comparison: str):
+        await asyncio.to_thread(self.record_comparison, topic_id, comparison)
+
+    async def aget_search(self, topic: str, max_age: float) -> Optional[List[Dict[str, Any]]]:
+        return await asyncio.to_thread(self.get_search, topic, max_age)
+
+    async def aget_source(self, url: str, max_age: float) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_source, url, max_age)
+
+    async def aretrieve(self, query: str, limit: int, max_age: float) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.retrieve, query, limit, max_age)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this process plus the number of stored sources and topics."""
+        conn = self._conn()
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["sources"] = conn.execute("SELECT COUNT(*) FROM sources WHERE summary IS NOT NULL").fetchone()[0]
+        stats["topics"] = conn.execute("SELECT COUNT(*) FROM topics").fetchone()[0]
+        return stats
+
+def corpus_from_env() -> Optional[ResearchCorpus]:
+    """
+    Opt-in corpus for the entry points: RESEARCH_CORPUS=1 (default path
+    .cache/corpus.sqlite) or RESEARCH_CORPUS_PATH=<file>.
+    """
+    path = os.environ.get("RESEARCH_CORPUS_PATH")
+    if not path and os.environ.get("RESEARCH_CORPUS", "").lower() not in ("1", "true", "yes"):
+        return None
+    return ResearchCorpus(path or DEFAULT_CORPUS_PATH)
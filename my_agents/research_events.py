@@ -0,0 +1,53 @@
+# agents/research_events.py
+from dataclasses import dataclass, field
+from typing import List, Dict, Any
+
+@dataclass
+class ResearchEvent:
+    """Base class for events yielded by ResearchOrchestrator.stream_research."""
+    topic: str
+
+@dataclass
+class SearchCompleted(ResearchEvent):
+    results: List[Dict[str, Any]]
+    elapsed: float
+
+@dataclass
+class SourceFetched(ResearchEvent):
+    index: int  # 0-based search rank
+    source: str
+    chars: int
+    elapsed: float
+
+@dataclass
+class SourceSummarized(ResearchEvent):
+    index: int
+    source: str
+    summary: str
+    elapsed: float
+
+@dataclass
+class SourceFailed(ResearchEvent):
+    index: int
+    source: str
+    error: str
+
+@dataclass
+class SourceDeduplicated(ResearchEvent):
+    """The source's text nearly matches an earlier source; it is not summarized."""
+    index: int
+    source: str
+    duplicate_of: str
+
+@dataclass
+class ComparisonReady(ResearchEvent):
+    table: str
+    elapsed: float
+
+@dataclass
+class ResearchCompleted(ResearchEvent):
+    """Always the last event. `output` is what run_research returns."""
+    output: str
+    summaries: List[Dict[str, Any]] = field(default_factory=list)
+    comparison: str = ""
+    elapsed: float = 0.0
@@ -0,0 +1,124 @@
+# agents/response_cache.py
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses(expires_at);
+"""
+
+class ResponseCache:
+    """
+    Memoizes agent responses keyed by agent name, model, instruction text and
+    message hash. Because the instruction is part of the key, editing an
+    agent's prompt invalidates its old entries automatically.
+
+    Lookups hit an in-memory LRU first and fall back to an optional SQLite
+    tier (`disk_path`) that survives restarts and is shared across processes.
+    """
+    def __init__(self, max_entries: int = 1024, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        if disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            conn = self._conn()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @staticmethod
+    def make_key(agent_name: str, model: str, instruction: str, message: str) -> str:
+        payload = json.dumps([agent_name, model, instruction, message], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.disk_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._memory[key] = (value, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._stats[counter] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                if item[1] > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return item[0]
+                del self._memory[key]
+
+        if self.disk_path:
+            row = self._conn().execute(
+                "SELECT value, expires_at FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                self._remember(key, row[0], row[1])
+                self._count("disk_hits")
+                return row[0]
+
+        self._count("misses")
+        return None
+
+    def put(self, key: str, value: str, ttl: float, agent: str = ""):
+        expires_at = time.time() + ttl
+        self._remember(key, value, expires_at)
+        if self.disk_path:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, agent, value, expires_at) VALUES (?, ?, ?, ?)",
+                (key, agent, value, expires_at),
+            )
+            # Opportunistically drop expired rows so the file does not grow forever
+            conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        self._count("stores")
+
+    async def aget(self, key: str) -> Optional[str]:
+        if not self.disk_path:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, value: str, ttl: float, agent: str = ""):
+        if not self.disk_path:
+            return self.put(key, value, ttl, agent)
+        await asyncio.to_thread(self.put, key, value, ttl, agent)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.disk_path:
+            self._conn().execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        return stats
@@ -0,0 +1,62 @@
+# agents/single_flight.py
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key starts `fn()` as a task; every caller awaiting
+    the same key while it runs gets the same result (or exception). Waiters
+    are shielded, so a caller that is cancelled (e.g. by a timeout) does not
+    cancel the shared work for everyone else.
+
+    With `keep_results=True` successful results are also memoized (up to
+    `max_results`, oldest dropped first) so later calls skip the work
+    entirely. Failures are never memoized.
+    """
+    def __init__(self, keep_results: bool = False, max_results: Optional[int] = None):
+        self.keep_results = keep_results
+        self.max_results = max_results
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._results: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.stats = {"executions": 0, "coalesced": 0, "memo_hits": 0}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """The memoized result for `key`, or None when there is none."""
+        if key not in self._results:
+            return None
+        self.stats["memo_hits"] += 1
+        self._results.move_to_end(key)
+        return self._results[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if self.keep_results and key in self._results:
+            self.stats["memo_hits"] += 1
+            self._results.move_to_end(key)
+            return self._results[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        # Reading the exception also marks it retrieved when no waiter is left
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self.keep_results:
+            self._results[key] = task.result()
+            if self.max_results is not None:
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
@@ -1,13 +1,39 @@
 # agents/worker_agents.py
+import asyncio
 import json
 import re
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional, Type, TypeVar, Union, Callable
+
+# google.adk / google.genai and the fetch tool are imported when an agent's
+# runner is first built (see BaseAgent.ensure_runner), not at import time
+from tools.text_chunker import split_into_chunks
+from tools.resilience import get_resilience
+from .response_cache import ResponseCache
+from session.agent_sessions import AgentSessions
+from observability.logging_metrics import MetricsLogger
+from observability.tracing import tracer
+
+logger = MetricsLogger("WorkerAgents")
+
+# Returned by SummarizerAgent when the model gives no usable summary
+SUMMARY_FALLBACK = "Unable to summarize the content."
+
+def record_token_usage(agent_name: str, events: List[Any]):
+    """Add the model's reported token usage from ADK events to the tracer counters."""
+    prompt_tokens = 0
+    output_tokens = 0
+    for event in events:
+        usage = getattr(event, 'usage_metadata', None)
+        if usage is None:
+            continue
+        prompt_tokens += getattr(usage, 'prompt_token_count', None) or 0
+        output_tokens += getattr(usage, 'candidates_token_count', None) or 0
+    if prompt_tokens:
+        tracer.inc("llm_tokens_total", prompt_tokens, agent=agent_name, kind="prompt")
+    if output_tokens:
+        tracer.inc("llm_tokens_total", output_tokens, agent=agent_name, kind="output")
 
-from google.adk.agents import Agent
-from google.adk.runners import InMemoryRunner
-from google.genai.types import Content, Part
-from tools.search_tool import google_search_tool
-from tools.fetch_tool import fetch_url
 async def extract_final_text(events: List[Any]) -> str:
     """
     Extract the final response text from the list of events.
@@ -29,50 +55,147 @@ async def extract_final_text(events: List[Any]) -> str:
             break
     return final_text.strip() or full_text.strip()
 
+def _search_tools() -> List[Any]:
+    from tools.search_tool import google_search_tool
+    return [google_search_tool]
+
+def _fetch_tools() -> List[Any]:
+    from tools.fetch_tool import fetch_url_async
+    return [fetch_url_async]
+
 class BaseAgent:
-    def __init__(self, name: str, model: str, instruction: str, tools: List[Any]):
-        self.agent = Agent(
-            name=name,
-            model=model,
-            instruction=instruction,
-            tools=tools,
-        )
-        self.runner = InMemoryRunner(app_name=f"{name}_app", agent=self.agent)
+    # Seconds a memoized response stays valid for this agent type; None means never cache
+    cache_ttl: Optional[float] = None
 
-    async def _run(self, message: str, user_id: str = "user_1") -> str:
-        session = await self.runner.session_service.create_session(
-            user_id=user_id,
-            app_name=f"{self.agent.name}_app"
-        )
-        session_id = session.id
+    def __init__(self, name: str, model: str, instruction: str,
+                 tools: Union[List[Any], Callable[[], List[Any]]],
+                 response_cache: Optional[ResponseCache] = None):
+        """
+        `tools` may be a callable returning the tool list, so tool modules are
+        only imported once the runner is built. Building the ADK Agent and
+        InMemoryRunner is deferred to the first model call.
+        """
+        self.name = name
+        self.model = model
+        self.instruction = instruction
+        self._tools = tools
+        self._agent = None
+        self._runner = None
+        self._sessions: Optional[AgentSessions] = None
+        self._build_lock = threading.Lock()
+        # Default cache when a call doesn't pass one (see _run)
+        self.response_cache = response_cache
+
+    def ensure_runner(self):
+        """Import the ADK stack and build this agent's Agent, runner and session scope once."""
+        if self._runner is not None:
+            return
+        with self._build_lock:
+            if self._runner is not None:
+                return
+            with tracer.span("agent.build", agent=self.name):
+                from google.adk.agents import Agent
+                from google.adk.runners import InMemoryRunner
+
+                tools = self._tools() if callable(self._tools) else self._tools
+                agent = Agent(
+                    name=self.name,
+                    model=self.model,
+                    instruction=self.instruction,
+                    tools=tools,
+                )
+                runner = InMemoryRunner(app_name=f"{self.name}_app", agent=agent)
+                # Every call gets a throwaway ADK session
+                self._sessions = AgentSessions(runner.session_service, app_name=f"{self.name}_app")
+                self._agent = agent
+                self._runner = runner
+
+    @property
+    def agent(self):
+        self.ensure_runner()
+        return self._agent
+
+    @property
+    def runner(self):
+        self.ensure_runner()
+        return self._runner
+
+    @property
+    def sessions(self) -> AgentSessions:
+        self.ensure_runner()
+        return self._sessions
+
+    def _cache_key(self, message: str, response_cache: Optional[ResponseCache]) -> Optional[str]:
+        if response_cache is None or not self.cache_ttl:
+            return None
+        return ResponseCache.make_key(self.name, self.model, self.instruction, message)
+
+    async def _run(self, message: str, user_id: str = "user_1",
+                   response_cache: Optional[ResponseCache] = None,
+                   call_limiter: Optional[asyncio.Semaphore] = None) -> str:
+        """
+        One model call. `response_cache` and `call_limiter` (a semaphore capping
+        concurrent model calls) come with each call, so agents shared between
+        orchestrators never share them; every run() method forwards them as
+        keyword arguments.
+        """
+        response_cache = response_cache if response_cache is not None else self.response_cache
+        with tracer.span(f"agent.{self.name}", model=self.model, input_chars=len(message)) as span:
+            cache_key = self._cache_key(message, response_cache)
+            if cache_key is not None:
+                cached = await response_cache.aget(cache_key)
+                if cached is not None:
+                    span.set(cache="hit")
+                    tracer.inc("agent_calls_total", agent=self.name, cache="hit")
+                    return cached
+
+            # Rate limit per model and retry 429/5xx with jittered backoff; the
+            # call limiter is only held while a request is actually in flight
+            text = await get_resilience().call_model(
+                self.model, f"agent.{self.name}", lambda: self._run_model(message, user_id),
+                limiter=call_limiter,
+            )
+            span.set(output_chars=len(text))
+            tracer.inc("agent_calls_total", agent=self.name, cache="miss")
+            if cache_key is not None and text:
+                await response_cache.aput(cache_key, text, self.cache_ttl, agent=self.name)
+            return text
+
+    async def _run_model(self, message: str, user_id: str) -> str:
+        from google.genai.types import Content, Part
 
         events = []
-        async for event in self.runner.run_async(
-            user_id=user_id,
-            session_id=session_id,
-            new_message=Content(parts=[Part(text=message)])
-        ):
-            events.append(event)
+        async with self.sessions.session(user_id) as session_id:
+            async for event in self.runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=Content(parts=[Part(text=message)])
+            ):
+                events.append(event)
 
+        record_token_usage(self.name, events)
         return await extract_final_text(events)
 
 class SearchAgent(BaseAgent):
+    cache_ttl = 6 * 3600
+
     def __init__(self):
         super().__init__(
             name="search_agent",
             model="gemini-2.5-flash-lite",
-            instruction="""You are a search agent. For the given query, call the google_search tool to get the top 3 relevant web results. 
-            After receiving the results, respond ONLY with a valid JSON array of the top 3 results, formatted as:
+            instruction="""You are a search agent. For the given query, call the google_search tool to get the requested number of relevant web results (3 if no number is given). 
+            After receiving the results, respond ONLY with a valid JSON array of those results, best first, formatted as:
             [
                 {"title": "page title", "link": "url", "snippet": "brief description"}
             ]
             Do not include any additional text outside the JSON.""",
-            tools=[google_search_tool],
+            tools=_search_tools,
         )
 
-    async def run(self, query: str, user_id: str = "user_1") -> List[Dict[str, str]]:
-        message = f"Search for: {query}"
-        text = await self._run(message, user_id)
+    async def run(self, query: str, user_id: str = "user_1", num_results: int = 3,
+                  **call_options) -> List[Dict[str, str]]:
+        message = f"Search for: {query}\nNumber of results: {num_results}"
+        text = await self._run(message, user_id, **call_options)
         # Debug: show raw agent output so we can see why links may be missing
         print("[SearchAgent] raw response:", text)
         if not text:
@@ -108,16 +231,18 @@ class FetchAgent(BaseAgent):
         super().__init__(
             name="fetch_agent",
             model="gemini-2.5-flash-lite",
-            instruction="""You are a fetch agent. Given a URL, call the fetch_url tool to retrieve the full text content of the webpage. 
+            instruction="""You are a fetch agent. Given a URL, call the fetch_url_async tool to retrieve the full text content of the webpage. 
             After fetching, respond ONLY with the entire fetched text content. Do not summarize or add commentary.""",
-            tools=[fetch_url],
+            tools=_fetch_tools,
         )
 
-    async def run(self, url: str, user_id: str = "user_1") -> str:
+    async def run(self, url: str, user_id: str = "user_1", **call_options) -> str:
         message = f"Fetch the content from this URL: {url}"
-        return await self._run(message, user_id) or f"Failed to fetch content from {url}"
+        return await self._run(message, user_id, **call_options) or f"Failed to fetch content from {url}"
 
 class SummarizerAgent(BaseAgent):
+    cache_ttl = 7 * 24 * 3600
+
     def __init__(self):
         super().__init__(
             name="summarizer_agent",
@@ -128,24 +253,151 @@ class SummarizerAgent(BaseAgent):
             tools=[],  # No tools needed
         )
 
-    async def run(self, text: str, user_id: str = "user_1") -> str:
+    async def run(self, text: str, user_id: str = "user_1", **call_options) -> str:
         # Truncate if too long for model
         if len(text) > 10000:
             text = text[:10000] + "\n... (content truncated)"
         message = f"Summarize this content:\n\n{text}"
-        return await self._run(message, user_id) or "Unable to summarize the content."
+        return await self._run(message, user_id, **call_options) or SUMMARY_FALLBACK
+
+    async def run_map_reduce(self, text: str, user_id: str = "user_1", chunk_tokens: int = 2500,
+                             max_chunks: int = 8, concurrency: int = 4, **call_options) -> str:
+        """
+        Summarize long content without truncation: split it into token-budgeted
+        chunks on paragraph boundaries, summarize the chunks concurrently (map),
+        then merge the partial summaries into the final 3-5 bullets (reduce).
+        Content that fits in one chunk takes the regular single-call path.
+        Chunks whose summary fails are logged and counted, and the result is
+        marked as partial.
+        """
+        chunks = split_into_chunks(text, max_tokens=chunk_tokens, max_chunks=max_chunks)
+        if len(chunks) <= 1:
+            return await self.run(text, user_id, **call_options)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def summarize_chunk(i: int, chunk: str) -> str:
+            async with semaphore:
+                message = f"Summarize part {i+1} of {len(chunks)} of this content:\n\n{chunk}"
+                return await self._run(message, user_id, **call_options)
+
+        results = await asyncio.gather(
+            *(summarize_chunk(i, c) for i, c in enumerate(chunks)), return_exceptions=True
+        )
+        partials = []
+        for i, r in enumerate(results):
+            if isinstance(r, str) and r.strip():
+                partials.append(r)
+            elif isinstance(r, BaseException):
+                logger.log(f"Summary of part {i+1}/{len(chunks)} failed: {type(r).__name__}: {r}", "WARNING")
+            else:
+                logger.log(f"Summary of part {i+1}/{len(chunks)} came back empty", "WARNING")
+        failed = len(chunks) - len(partials)
+        tracer.inc("summary_chunks_total", len(partials), status="ok")
+        if failed:
+            tracer.inc("summary_chunks_total", failed, status="failed")
+        if not partials:
+            return SUMMARY_FALLBACK
+        if len(partials) == 1:
+            summary = partials[0]
+        else:
+            message = (
+                "These are summaries of consecutive parts of one document. Merge them into "
+                "a single summary of 3-5 concise bullet points without repeating points:\n\n"
+                + "\n\n".join(f"Part {i+1}:\n{p}" for i, p in enumerate(partials))
+            )
+            summary = await self._run(message, user_id, **call_options)
+            if not summary:
+                return SUMMARY_FALLBACK
+        if failed:
+            # Don't let a summary of a few parts pass for one of the whole page
+            summary += f"\n(Partial summary: {len(partials)} of {len(chunks)} parts could be summarized.)"
+        return summary
+
+def _cell(value: Any) -> str:
+    """Flatten a JSON field (string or list of strings) into one text value."""
+    if isinstance(value, list):
+        return "\n".join(str(v).strip() for v in value if str(v).strip())
+    return str(value or "").strip()
+
+def parse_comparison_rows(text: str) -> List[Dict[str, str]]:
+    """
+    Parse ComparisonAgent output into {"source", "summary", "pros", "cons"}
+    rows in one pass. Accepts the requested JSON array (optionally fenced)
+    and falls back to a markdown table with the same columns.
+    """
+    if not text:
+        return []
+    match = re.search(r"\[.*\]", text, flags=re.DOTALL)
+    if match:
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, list):
+            return [
+                {"source": _cell(r.get("source")), "summary": _cell(r.get("summary")),
+                 "pros": _cell(r.get("pros")), "cons": _cell(r.get("cons"))}
+                for r in data if isinstance(r, dict)
+            ]
+
+    rows = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line.startswith("|"):
+            continue
+        cols = [c.strip() for c in line.strip("|").split("|")]
+        # Skip the header and the |---| separator
+        if len(cols) < 4 or cols[0].lower() == "source" or set(cols[0]) <= set("-: "):
+            continue
+        rows.append({"source": cols[0], "summary": cols[1],
+                     "pros": cols[2].replace("<br>", "\n"), "cons": cols[3].replace("<br>", "\n")})
+    return rows
 
 class ComparisonAgent(BaseAgent):
+    cache_ttl = 24 * 3600
+
     def __init__(self):
         super().__init__(
             name="comparison_agent",
             model="gemini-2.5-flash-lite",
-            instruction="""You are a comparison agent. Given summaries from multiple sources, create a markdown table comparing them.
-            Columns: | Source | Summary | Pros | Cons |
+            instruction="""You are a comparison agent. Given summaries from multiple sources, compare them.
+            Respond ONLY with a valid JSON array containing one object per source, in the order given, formatted as:
+            [
+                {"source": "source URL exactly as given", "summary": "one or two sentence summary", "pros": ["..."], "cons": ["..."]}
+            ]
             For each source, briefly extract 1-2 pros and cons based on the summary's content, focusing on strengths/weaknesses in approach, insights, or applicability.
-            If only one source, still create the table. Output only the markdown table.""",
+            If only one source, still return an array. Do not include any additional text outside the JSON.""",
             tools=[],  # No tools needed
         )
 
-    async def run(self, input_text: str, user_id: str = "user_1") -> str:
-        return await self._run(input_text, user_id) or "| Source | Summary | Pros | Cons |\n|--------|---------|------|------|\n| None | No data | N/A | N/A |"
\ No newline at end of file
+    async def run(self, summaries: List[Dict[str, Any]], user_id: str = "user_1",
+                  **call_options) -> List[Dict[str, str]]:
+        """Compare one group of {"source", "summary"} items and return a row per source."""
+        message = "Compare these sources:\n\n"
+        for s in summaries:
+            message += f"Source: {s['source']}\nSummary: {s['summary']}\n\n"
+        rows = parse_comparison_rows(await self._run(message, user_id, **call_options))
+        for i, row in enumerate(rows):
+            # Rows come back in input order; fill in a source the model left out
+            if not row["source"] and i < len(summaries):
+                row["source"] = summaries[i]["source"]
+        return rows
+
+# Process-wide agent instances, see shared_agent
+AgentT = TypeVar("AgentT", bound=BaseAgent)
+
+_shared_agents: Dict[type, BaseAgent] = {}
+_shared_lock = threading.Lock()
+
+def shared_agent(cls: Type[AgentT]) -> AgentT:
+    """
+    Process-wide instance of an agent class, built on first request.
+    Building an ADK agent and runner is costly, so orchestrators (and every
+    request in service mode) reuse these instead of constructing their own.
+    """
+    with _shared_lock:
+        agent = _shared_agents.get(cls)
+        if agent is None:
+            agent = _shared_agents[cls] = cls()
+        return agent
@@ -30,10 +30,10 @@ class MetricsLogger:
     # For async functions, use manually in code
     def time_async_operation(self, operation_name: str) -> tuple[Callable, Callable]:
         async def start_timer():
-            return time.time()
+            return time.perf_counter()
 
         def end_timer(start_time: float):
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             self.log(f"{operation_name} completed in {duration:.2f} seconds")
             return duration
 
@@ -44,9 +44,9 @@ class MetricsLogger:
         def decorator(func: Callable) -> Callable:
             @wraps(func)
             def wrapper(*args, **kwargs):
-                start_time = time.time()
+                start_time = time.perf_counter()
                 result = func(*args, **kwargs)
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 self.log(f"{operation_name} completed in {duration:.2f} seconds")
                 return result
             return wrapper
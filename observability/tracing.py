@@ -0,0 +1,204 @@
+# observability/tracing.py
+import contextvars
+import itertools
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+_span_ids = itertools.count(1)
+
+class Span:
+    """One timed operation. Parent/trace ids come from the enclosing span in the current context."""
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attrs", "start_wall",
+                 "_start", "duration", "status", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.name = name
+        self.span_id = f"{os.getpid():x}-{next(_span_ids):x}"
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self.parent_id = parent.span_id if parent else None
+        self.attrs = attrs
+        self.start_wall = time.time()
+        self._start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since start (final duration once the span has ended)."""
+        return self.duration if self.duration is not None else time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start_wall,
+            "duration": self.duration,
+            "status": self.status,
+            "error": self.error,
+            "attrs": self.attrs,
+        }
+
+class Histogram:
+    """Latency samples with a bounded reservoir for percentile estimates."""
+    def __init__(self, max_samples: int = 4096):
+        self.max_samples = max_samples
+        self.samples: List[float] = []
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        if len(self.samples) < self.max_samples:
+            self.samples.append(value)
+        else:
+            # Reservoir sampling keeps a uniform sample of everything observed
+            i = random.randrange(self.count)
+            if i < self.max_samples:
+                self.samples[i] = value
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(0, math.ceil(p / 100.0 * len(ordered)) - 1)
+        return ordered[rank]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "p50": round(self.percentile(50), 6),
+            "p95": round(self.percentile(95), 6),
+            "p99": round(self.percentile(99), 6),
+        }
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+class Tracer:
+    """
+    Process-wide spans, latency histograms and counters.
+
+    Spans nest through a ContextVar, so each asyncio task (research job,
+    source, agent call) sees its own parent chain and concurrent jobs never
+    mix. Every finished span feeds a duration histogram keyed by span name.
+    """
+    def __init__(self, max_spans: int = 10000):
+        self._lock = threading.Lock()
+        self._spans: deque = deque(maxlen=max_spans)
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[LabelKey, float] = {}
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        span = Span(name, _current_span.get(), attrs)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.perf_counter() - span._start
+            with self._lock:
+                self._spans.append(span)
+                self._histograms.setdefault(name, Histogram()).observe(span.duration)
+            # Raises if the span is closed from another context, e.g. held open
+            # across the yields of an async generator; keep spans out of those
+            _current_span.reset(token)
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def observe(self, name: str, value: float):
+        """Record a latency sample without a span."""
+        with self._lock:
+            self._histograms.setdefault(name, Histogram()).observe(value)
+
+    def percentile(self, name: str, p: float, min_count: int = 1) -> Optional[float]:
+        """Current p-th percentile of a histogram, or None with fewer than `min_count` samples."""
+        with self._lock:
+            h = self._histograms.get(name)
+            if h is None or h.count < min_count:
+                return None
+            return h.percentile(p)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def latency_summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: h.summary() for name, h in sorted(self._histograms.items())}
+
+    def counters(self) -> Dict[str, float]:
+        with self._lock:
+            items = list(self._counters.items())
+        return {_format_series(name, labels): value for (name, labels), value in sorted(items)}
+
+    def export_jsonl(self, path: str) -> int:
+        """Append finished spans to `path` as JSON lines and drop them from memory."""
+        with self._lock:
+            spans = list(self._spans)
+            self._spans.clear()
+        with open(path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+        return len(spans)
+
+    def prometheus_text(self) -> str:
+        """Render histograms (as summaries) and counters in Prometheus text format."""
+        lines = [
+            "# HELP span_duration_seconds Duration of traced operations.",
+            "# TYPE span_duration_seconds summary",
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            for name, h in histograms:
+                for q in (0.5, 0.95, 0.99):
+                    series = _format_series("span_duration_seconds", (("quantile", str(q)), ("span", name)))
+                    lines.append(f"{series} {h.percentile(q * 100):.6f}")
+                lines.append(f"{_format_series('span_duration_seconds_sum', (('span', name),))} {h.total:.6f}")
+                lines.append(f"{_format_series('span_duration_seconds_count', (('span', name),))} {h.count}")
+
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{_format_series(name, labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._histograms.clear()
+            self._counters.clear()
+
+def _format_series(name: str, labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"')) for k, v in labels
+    )
+    return f"{name}{{{rendered}}}"
+
+# Shared tracer used by the orchestrator, agents and tools
+tracer = Tracer()
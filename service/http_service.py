@@ -0,0 +1,304 @@
+# service/http_service.py
+"""
+Long-running HTTP API around ResearchOrchestrator.
+
+Jobs go through a bounded queue drained by a fixed number of workers; when
+the queue is full new topics are rejected with 429 and a Retry-After hint.
+A topic that is already queued or running is not researched twice: the new
+request is attached to the existing job. Agents, connection pools and
+caches are built once per process and shared by every job.
+
+Usage:
+    python -m service.http_service --port 8080 --workers 4 --queue-size 100
+
+    POST /research      {"topic": "...", "max_results": 3, "wait": false}
+                        -> 202 {"job_id": ..., "status": "queued", "coalesced": false}
+    GET  /jobs/{job_id} -> status, progress events and, once done, the result
+    GET  /health        -> queue depth and worker usage
+    GET  /metrics       -> tracer counters and latencies (Prometheus text)
+"""
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import asyncio
+import dataclasses
+import math
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from my_agents.research_agent import ResearchOrchestrator
+from my_agents.response_cache import ResponseCache
+from my_agents.research_corpus import ResearchCorpus
+from my_agents.research_events import ResearchEvent, ResearchCompleted
+from observability.logging_metrics import MetricsLogger
+from observability.tracing import tracer
+
+class QueueFullError(RuntimeError):
+    """Raised by ResearchService.submit when no queue slot is free."""
+    def __init__(self, retry_after: int):
+        super().__init__(f"Research queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+def topic_key(topic: str, max_results: int) -> Tuple[str, int]:
+    """Requests with the same key are served by one job."""
+    return " ".join(topic.lower().split()), max_results
+
+def event_to_dict(event: ResearchEvent) -> Dict[str, Any]:
+    data = dataclasses.asdict(event)
+    data["type"] = type(event).__name__
+    return data
+
+class ResearchJob:
+    """One research run and everything a client can poll about it."""
+    def __init__(self, topic: str, max_results: int):
+        self.id = uuid.uuid4().hex
+        self.topic = topic
+        self.max_results = max_results
+        self.key = topic_key(topic, max_results)
+        self.status = "queued"  # queued -> running -> done | failed
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.requests = 1
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "topic": self.topic,
+            "max_results": self.max_results,
+            "status": self.status,
+            "requests": self.requests,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "events": self.events,
+            "result": self.result,
+            "error": self.error,
+        }
+
+class ResearchService:
+    """
+    Job queue, worker pool and in-flight coalescing on top of one shared
+    ResearchOrchestrator.
+
+    Args:
+        orchestrator: Orchestrator every job runs on (its agents are shared).
+        workers: Research jobs running at once.
+        queue_size: Jobs allowed to wait for a worker before submit rejects.
+        max_results_limit: Upper bound on the sources a client may request.
+        keep_finished: Finished jobs kept for polling, oldest dropped first.
+    """
+    def __init__(self, orchestrator: ResearchOrchestrator, workers: int = 4, queue_size: int = 100,
+                 max_results_limit: int = 10, keep_finished: int = 1000):
+        self.orchestrator = orchestrator
+        self.workers = max(1, workers)
+        self.max_results_limit = max_results_limit
+        self.keep_finished = keep_finished
+        self.queue: "asyncio.Queue[ResearchJob]" = asyncio.Queue(maxsize=max(1, queue_size))
+        self.jobs: "OrderedDict[str, ResearchJob]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, int], ResearchJob] = {}
+        self._finished: deque = deque()
+        self._worker_tasks: List[asyncio.Task] = []
+        self.busy_workers = 0
+        self.logger = MetricsLogger("ResearchService")
+        self.stats = {"submitted": 0, "coalesced": 0, "rejected": 0, "done": 0, "failed": 0}
+
+    async def start(self):
+        for n in range(self.workers):
+            self._worker_tasks.append(asyncio.create_task(self._worker(n), name=f"research-worker-{n}"))
+        self.logger.log(f"Research service started with {self.workers} worker(s), queue size {self.queue.maxsize}")
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks.clear()
+
+    def retry_after(self) -> int:
+        """Rough seconds until a queue slot frees up, from the median job time."""
+        job_p50 = tracer.percentile("research.job", 50) or 30.0
+        return max(1, math.ceil(job_p50 * self.queue.qsize() / self.workers))
+
+    def submit(self, topic: str, max_results: int = 3) -> Tuple[ResearchJob, bool]:
+        """
+        Queue a research job, or attach to the identical job already queued or
+        running. Returns (job, coalesced); raises QueueFullError when saturated.
+        """
+        max_results = max(1, min(max_results, self.max_results_limit))
+        job = self._inflight.get(topic_key(topic, max_results))
+        if job is not None:
+            job.requests += 1
+            self.stats["coalesced"] += 1
+            tracer.inc("service_requests_total", outcome="coalesced")
+            return job, True
+
+        job = ResearchJob(topic, max_results)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            tracer.inc("service_requests_total", outcome="rejected")
+            raise QueueFullError(self.retry_after())
+        self.jobs[job.id] = job
+        self._inflight[job.key] = job
+        self.stats["submitted"] += 1
+        tracer.inc("service_requests_total", outcome="queued")
+        return job, False
+
+    def get_job(self, job_id: str) -> Optional[ResearchJob]:
+        return self.jobs.get(job_id)
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "busy_workers": self.busy_workers,
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "jobs_in_flight": len(self._inflight),
+            "jobs_tracked": len(self.jobs),
+            **self.stats,
+        }
+
+    async def _worker(self, n: int):
+        while True:
+            job = await self.queue.get()
+            self.busy_workers += 1
+            try:
+                await self._run_job(job)
+            finally:
+                self.busy_workers -= 1
+                self.queue.task_done()
+
+    async def _run_job(self, job: ResearchJob):
+        job.status = "running"
+        job.started = time.time()
+        tracer.observe("service.queue_wait", job.started - job.created)
+        try:
+            async for event in self.orchestrator.stream_research(job.topic, job.max_results,
+                                                                 user_id=f"job_{job.id}"):
+                if isinstance(event, ResearchCompleted):
+                    job.result = event_to_dict(event)
+                else:
+                    job.events.append(event_to_dict(event))
+            job.status = "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e) or type(e).__name__
+            self.logger.log(f"Job {job.id} ({job.topic!r}) failed: {job.error}", "ERROR")
+        finally:
+            if job.status == "running":
+                # Worker cancelled on shutdown
+                job.status = "failed"
+                job.error = "Service stopped"
+            job.finished = time.time()
+            self.stats[job.status] += 1
+            tracer.inc("service_jobs_total", status=job.status)
+            self._inflight.pop(job.key, None)
+            job.done.set()
+            self._retire(job)
+
+    def _retire(self, job: ResearchJob):
+        self._finished.append(job.id)
+        while len(self._finished) > self.keep_finished:
+            self.jobs.pop(self._finished.popleft(), None)
+
+SERVICE_KEY = web.AppKey("research_service", ResearchService)
+
+async def handle_research(request: web.Request) -> web.Response:
+    service = request.app[SERVICE_KEY]
+    try:
+        body = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text="Request body must be JSON")
+    topic = str(body.get("topic") or "").strip() if isinstance(body, dict) else ""
+    if not topic:
+        raise web.HTTPBadRequest(text="'topic' is required")
+    try:
+        max_results = int(body.get("max_results", 3))
+    except (TypeError, ValueError):
+        raise web.HTTPBadRequest(text="'max_results' must be an integer")
+
+    try:
+        job, coalesced = service.submit(topic, max_results)
+    except QueueFullError as e:
+        return web.json_response({"error": str(e)}, status=429,
+                                 headers={"Retry-After": str(e.retry_after)})
+
+    if body.get("wait") or request.query.get("wait") in ("1", "true", "yes"):
+        await job.done.wait()
+        return web.json_response({**job.to_dict(), "coalesced": coalesced})
+    return web.json_response({"job_id": job.id, "status": job.status, "coalesced": coalesced},
+                             status=202, headers={"Location": f"/jobs/{job.id}"})
+
+async def handle_job(request: web.Request) -> web.Response:
+    job = request.app[SERVICE_KEY].get_job(request.match_info["job_id"])
+    if job is None:
+        raise web.HTTPNotFound(text="Unknown job id")
+    return web.json_response(job.to_dict())
+
+async def handle_health(request: web.Request) -> web.Response:
+    return web.json_response(request.app[SERVICE_KEY].health())
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    return web.Response(text=tracer.prometheus_text(), content_type="text/plain")
+
+def create_app(service: ResearchService) -> web.Application:
+    app = web.Application()
+    app[SERVICE_KEY] = service
+    app.router.add_post("/research", handle_research)
+    app.router.add_get("/jobs/{job_id}", handle_job)
+    app.router.add_get("/health", handle_health)
+    app.router.add_get("/metrics", handle_metrics)
+
+    async def on_startup(app: web.Application):
+        await service.start()
+
+    async def on_cleanup(app: web.Application):
+        await service.stop()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve research jobs over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=4, help="Research jobs running at once")
+    parser.add_argument("--queue-size", type=int, default=100, help="Waiting jobs before requests get 429")
+    parser.add_argument("--llm-concurrency", type=int, default=16, help="Global cap on concurrent model calls")
+    parser.add_argument("--fetch-concurrency", type=int, default=32, help="Global cap on concurrent page fetches")
+    parser.add_argument("--summarize-mode", choices=["truncate", "map_reduce"], default="truncate")
+    parser.add_argument("--corpus", help="SQLite research corpus to store results in and reuse them from")
+    parser.add_argument("--corpus-mode", choices=["record", "seed", "answer"], default="record")
+    parser.add_argument("--corpus-max-age", type=float, default=7 * 24 * 3600, help="Corpus freshness (s)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    response_cache = None
+    if os.getenv("RESPONSE_CACHE", "").lower() in ("1", "true", "yes"):
+        response_cache = ResponseCache(disk_path=os.getenv("RESPONSE_CACHE_PATH"))
+    orchestrator = ResearchOrchestrator(
+        summarize_mode=args.summarize_mode,
+        response_cache=response_cache,
+        corpus=ResearchCorpus(args.corpus) if args.corpus else None,
+        corpus_mode=args.corpus_mode,
+        corpus_max_age=args.corpus_max_age,
+    )
+    orchestrator.configure_limits(args.llm_concurrency, args.fetch_concurrency)
+    # Jobs running at the same time share sources in flight, without memoizing them forever
+    orchestrator.enable_source_memo(keep_results=False)
+    service = ResearchService(orchestrator, workers=args.workers, queue_size=args.queue_size)
+    web.run_app(create_app(service), host=args.host, port=args.port)
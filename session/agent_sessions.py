@@ -0,0 +1,36 @@
+# session/agent_sessions.py
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+class AgentSessions:
+    """
+    Scopes the ADK sessions of one runner's session service to agent calls.
+
+    The agents are stateless: nothing is reused. Every call creates a session
+    and deletes it as soon as the call finishes, so prompts never see each
+    other's history and the runner's session store stays flat no matter how
+    many calls go through it. ADK has no way to clear a session's events, so
+    this per-call create/delete (two in-memory dict operations) is the
+    cheapest isolation available.
+    """
+    def __init__(self, session_service: Any, app_name: str):
+        self.session_service = session_service
+        self.app_name = app_name
+        self.stats = {"created": 0, "deleted": 0, "active": 0}
+
+    @asynccontextmanager
+    async def session(self, user_id: str) -> AsyncIterator[str]:
+        """Yield a fresh session id for one agent call by `user_id`."""
+        session = await self.session_service.create_session(app_name=self.app_name, user_id=user_id)
+        self.stats["created"] += 1
+        self.stats["active"] += 1
+        try:
+            yield session.id
+        finally:
+            self.stats["active"] -= 1
+            try:
+                await self.session_service.delete_session(
+                    app_name=self.app_name, user_id=user_id, session_id=session.id
+                )
+            finally:
+                self.stats["deleted"] += 1
@@ -1,50 +1,154 @@
 # session/in_memory_session.py
 import asyncio
-from typing import Dict, Any, List, Optional
+import itertools
+import sys
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
+from typing import Dict, Any, List, Optional, Deque
+
+class MessageRecord:
+    """One conversation message; __slots__ keeps per-message overhead small."""
+    __slots__ = ("role", "content", "timestamp")
+
+    def __init__(self, role: str, content: str, timestamp: float):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp  # epoch seconds
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+class SessionRecord:
+    __slots__ = ("user_id", "app_name", "memory", "created_at", "last_access", "metadata")
+
+    def __init__(self, user_id: str, app_name: str, max_messages: int, now: float):
+        self.user_id = user_id
+        self.app_name = app_name
+        # Ring buffer: the oldest messages fall off once max_messages is reached
+        self.memory: Deque[MessageRecord] = deque(maxlen=max_messages)
+        self.created_at = now
+        self.last_access = now
+        self.metadata: Dict[str, Any] = {}
 
 class InMemorySessionManager:
     """
     Simple in-memory session manager for tracking sessions across agents.
     Can be integrated for shared memory in future extensions.
+
+    Memory is bounded: each session keeps at most `max_messages` messages,
+    sessions idle for longer than `idle_ttl` seconds are evicted, and at most
+    `max_sessions` sessions are kept (least recently used evicted first).
     """
-    def __init__(self):
-        self.sessions: Dict[str, Dict[str, Any]] = {}
-        self.user_sessions: Dict[str, List[str]] = {}  # Track sessions per user
+    def __init__(self, max_sessions: int = 10_000, max_messages: int = 100,
+                 idle_ttl: Optional[float] = 3600.0):
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self.idle_ttl = idle_ttl
+        # Ordered by last access, least recently used first
+        self.sessions: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self.user_sessions: Dict[str, Dict[str, None]] = {}  # Track sessions per user (ordered set)
+        self._ids = itertools.count(1)
+        self.evictions = {"idle": 0, "lru": 0}
 
     async def create_session(self, user_id: str, app_name: str = "default") -> 'Session':
         loop_time = asyncio.get_event_loop().time()
-        session_id = f"{user_id}_{app_name}_{int(loop_time * 1000)}"
-        created_at = datetime.now().isoformat()
-        self.sessions[session_id] = {
-            "user_id": user_id,
-            "app_name": app_name,
-            "memory": [],  # List of messages for conversation history
-            "created_at": created_at,
-            "metadata": {}
-        }
-        if user_id not in self.user_sessions:
-            self.user_sessions[user_id] = []
-        self.user_sessions[user_id].append(session_id)
+        session_id = f"{user_id}_{app_name}_{int(loop_time * 1000)}_{next(self._ids)}"
+        now = time.time()
+        self.evict_idle(now)
+        self.sessions[session_id] = SessionRecord(user_id, app_name, self.max_messages, now)
+        self.user_sessions.setdefault(user_id, {})[session_id] = None
+        while len(self.sessions) > self.max_sessions:
+            oldest_id = next(iter(self.sessions))
+            self.delete_session(oldest_id)
+            self.evictions["lru"] += 1
         return Session(session_id, self)
 
+    def _touch(self, session_id: str) -> Optional[SessionRecord]:
+        record = self.sessions.get(session_id)
+        if record is not None:
+            record.last_access = time.time()
+            self.sessions.move_to_end(session_id)
+        return record
+
     def add_to_memory(self, session_id: str, content: str, role: str = "assistant"):
-        if session_id in self.sessions:
-            self.sessions[session_id]["memory"].append({
-                "role": role,
-                "content": content,
-                "timestamp": datetime.now().isoformat()
-            })
+        record = self._touch(session_id)
+        if record is not None:
+            record.memory.append(MessageRecord(role, content, record.last_access))
 
     def get_memory(self, session_id: str, limit: int = 10) -> List[Dict[str, str]]:
-        memory = self.sessions.get(session_id, {}).get("memory", [])
-        return memory[-limit:] if len(memory) > limit else memory
+        record = self._touch(session_id)
+        if record is None or limit <= 0:
+            return []
+        # Walk the ring buffer from the newest end so only `limit` records are visited
+        newest = list(itertools.islice(reversed(record.memory), limit))
+        return [m.to_dict() for m in reversed(newest)]
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        return self.sessions.get(session_id)
+        record = self._touch(session_id)
+        if record is None:
+            return None
+        return {
+            "user_id": record.user_id,
+            "app_name": record.app_name,
+            "memory": [m.to_dict() for m in record.memory],
+            "created_at": datetime.fromtimestamp(record.created_at).isoformat(),
+            "metadata": record.metadata
+        }
 
     def list_user_sessions(self, user_id: str) -> List[str]:
-        return self.user_sessions.get(user_id, [])
+        return list(self.user_sessions.get(user_id, ()))
+
+    def delete_session(self, session_id: str) -> bool:
+        record = self.sessions.pop(session_id, None)
+        if record is None:
+            return False
+        user_ids = self.user_sessions.get(record.user_id)
+        if user_ids is not None:
+            user_ids.pop(session_id, None)
+            if not user_ids:
+                del self.user_sessions[record.user_id]
+        return True
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Drop sessions not accessed within idle_ttl. Returns how many were evicted."""
+        if not self.idle_ttl:
+            return 0
+        cutoff = (now or time.time()) - self.idle_ttl
+        evicted = 0
+        # LRU order means idle sessions are all at the front
+        while self.sessions:
+            oldest_id, oldest = next(iter(self.sessions.items()))
+            if oldest.last_access >= cutoff:
+                break
+            self.delete_session(oldest_id)
+            evicted += 1
+        self.evictions["idle"] += evicted
+        return evicted
+
+    def memory_stats(self) -> Dict[str, Any]:
+        """Session/message counts and an approximate footprint in bytes."""
+        messages = 0
+        approx_bytes = sys.getsizeof(self.sessions) + sys.getsizeof(self.user_sessions)
+        for record in self.sessions.values():
+            messages += len(record.memory)
+            approx_bytes += sys.getsizeof(record) + sys.getsizeof(record.memory) + sys.getsizeof(record.metadata)
+            for m in record.memory:
+                approx_bytes += sys.getsizeof(m) + sys.getsizeof(m.content)
+        return {
+            "sessions": len(self.sessions),
+            "users": len(self.user_sessions),
+            "messages": messages,
+            "approx_bytes": approx_bytes,
+            "max_sessions": self.max_sessions,
+            "max_messages_per_session": self.max_messages,
+            "evicted_idle": self.evictions["idle"],
+            "evicted_lru": self.evictions["lru"],
+        }
 
 class Session:
     def __init__(self, id: str, manager: InMemorySessionManager):
@@ -0,0 +1,96 @@
+# tests/test_adk_client.py
+import asyncio
+
+import pytest
+
+from adk_client import ADKLLMClient, GenerationBackend, MCPBackend, MicroBatcher, StubBackend
+
+class RecordingHandler:
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.batches = []
+
+    async def __call__(self, key, items):
+        self.batches.append((key, list(items)))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [f"{key}:{item}" for item in items]
+
+def test_concurrent_items_share_batches_per_key():
+    handler = RecordingHandler()
+
+    async def main():
+        batcher = MicroBatcher(handler, max_batch_size=3, max_wait=0.01)
+        jobs = [batcher.submit("a", i) for i in range(5)] + [batcher.submit("b", 9)]
+        return batcher, await asyncio.gather(*jobs)
+
+    batcher, results = asyncio.run(main())
+    assert results == ["a:0", "a:1", "a:2", "a:3", "a:4", "b:9"]
+    assert sorted(handler.batches) == [("a", [0, 1, 2]), ("a", [3, 4]), ("b", [9])]
+    assert batcher.stats == {"items": 6, "batches": 3, "max_batch": 3}
+
+def test_handler_errors_reach_every_submitter():
+    async def main():
+        batcher = MicroBatcher(RecordingHandler(error=ValueError("backend down")))
+        return await asyncio.gather(batcher.submit("k", 1), batcher.submit("k", 2), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+
+def test_wrong_result_count_is_an_error():
+    async def short(key, items):
+        return items[:1]
+
+    async def main():
+        batcher = MicroBatcher(short)
+        return await asyncio.gather(batcher.submit("k", 1), batcher.submit("k", 2), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(main()))
+
+def test_cancelled_batch_releases_its_submitters():
+    async def main():
+        batcher = MicroBatcher(RecordingHandler(delay=10))
+        jobs = [asyncio.ensure_future(batcher.submit("k", i)) for i in range(2)]
+        await asyncio.sleep(0.05)
+        for task in batcher._tasks:
+            task.cancel()
+        return await asyncio.wait_for(asyncio.gather(*jobs, return_exceptions=True), timeout=1)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+def test_batches_skip_cancelled_callers():
+    handler = RecordingHandler()
+
+    async def main():
+        batcher = MicroBatcher(handler, max_wait=0.02)
+        gone = asyncio.ensure_future(batcher.submit("k", "gone"))
+        kept = asyncio.ensure_future(batcher.submit("k", "kept"))
+        lonely = asyncio.ensure_future(batcher.submit("other", "gone too"))
+        await asyncio.sleep(0)
+        gone.cancel()
+        lonely.cancel()
+        return await kept
+
+    assert asyncio.run(main()) == "k:kept"
+    # The batch of only cancelled callers never reached the handler
+    assert handler.batches == [("k", ["kept"])]
+
+def test_client_batches_prompts_with_the_same_settings():
+    backend = StubBackend(batch_latency=0.01, per_prompt_latency=0)
+
+    async def main():
+        client = ADKLLMClient(backend=backend, max_batch_size=8)
+        return await client.agenerate_many([f"prompt {i}" for i in range(8)])
+
+    results = asyncio.run(main())
+    assert len(results) == 8 and results[0].startswith("LLM_STUB_SUMMARY: prompt 0")
+    assert backend.calls == 1
+
+def test_backends_must_implement_their_batch_method():
+    with pytest.raises(TypeError):
+        GenerationBackend()
+    with pytest.raises(TypeError):
+        MCPBackend()
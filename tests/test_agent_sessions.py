@@ -0,0 +1,49 @@
+# tests/test_agent_sessions.py
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from session.agent_sessions import AgentSessions
+
+class FakeSessionService:
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.live = set()
+
+    async def create_session(self, app_name, user_id):
+        session_id = f"s{next(self.ids)}"
+        self.live.add(session_id)
+        return SimpleNamespace(id=session_id)
+
+    async def delete_session(self, app_name, user_id, session_id):
+        self.live.discard(session_id)
+
+async def call(sessions: AgentSessions, user_id: str) -> str:
+    async with sessions.session(user_id) as session_id:
+        return session_id
+
+def test_stateless_calls_get_a_fresh_session_that_is_deleted():
+    service = FakeSessionService()
+    sessions = AgentSessions(service, "app")
+
+    async def main():
+        return [await call(sessions, "u1") for _ in range(3)]
+
+    assert len(set(asyncio.run(main()))) == 3
+    assert service.live == set()
+    assert sessions.stats == {"created": 3, "deleted": 3, "active": 0}
+
+def test_session_is_deleted_when_the_call_fails():
+    service = FakeSessionService()
+    sessions = AgentSessions(service, "app")
+
+    async def main():
+        async with sessions.session("u1"):
+            raise RuntimeError("model error")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(main())
+    assert service.live == set()
+    assert sessions.stats == {"created": 1, "deleted": 1, "active": 0}
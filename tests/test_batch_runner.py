@@ -0,0 +1,85 @@
+# tests/test_batch_runner.py
+import asyncio
+import json
+
+from my_agents.batch_runner import BatchResearchRunner, load_completed_ids, load_topics
+from my_agents.research_agent import DEFAULT_MEMO_SOURCES
+from my_agents.research_events import ResearchCompleted, SourceFailed
+from my_agents.single_flight import SingleFlight
+
+def write_lines(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+class FakeOrchestrator:
+    """Stands in for ResearchOrchestrator: outcome per topic is "ok", "empty" or "error"."""
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.researched = []
+        self.source_memo = None
+
+    def configure_limits(self, llm_concurrency=None, fetch_concurrency=None):
+        pass
+
+    def enable_source_memo(self, max_sources=None, keep_results=True):
+        self.source_memo = SingleFlight(keep_results=keep_results, max_results=max_sources)
+
+    async def stream_research(self, topic, max_results=3, user_id=None):
+        self.researched.append(topic)
+        outcome = self.outcomes.get(topic, "ok")
+        if outcome == "error":
+            raise RuntimeError("search failed")
+        if outcome == "empty":
+            yield SourceFailed(topic, 0, "https://example.com/a", "timed out")
+            yield ResearchCompleted(topic, "No valid sources to compare.")
+            return
+        summaries = [{"source": "https://example.com/a", "summary": "- point"}]
+        yield ResearchCompleted(topic, "output", summaries, "| table |", 0.1)
+
+def test_load_topics_accepts_strings_and_objects_and_drops_repeats(tmp_path):
+    path = tmp_path / "topics.jsonl"
+    write_lines(path, ['"alpha"', '{"topic": "beta", "id": "b"}', '', '{"topic": "  "}', '"alpha"'])
+    assert load_topics(str(path)) == [{"id": "alpha", "topic": "alpha"}, {"id": "b", "topic": "beta"}]
+
+def test_load_completed_ids_only_counts_ok_records(tmp_path):
+    path = tmp_path / "results.jsonl"
+    write_lines(path, [
+        json.dumps({"id": "a", "status": "ok"}),
+        json.dumps({"id": "b", "status": "error"}),
+        json.dumps({"id": "c", "status": "empty"}),
+        "[]",
+        "1",
+        '"ok"',
+        'null',
+        '{"id": "d", "status": "o',  # torn last write
+    ])
+    assert load_completed_ids(str(path)) == {"a"}
+
+def test_load_completed_ids_missing_file(tmp_path):
+    assert load_completed_ids(str(tmp_path / "missing.jsonl")) == set()
+
+def test_resume_reruns_failed_and_empty_topics(tmp_path):
+    topics = tmp_path / "topics.jsonl"
+    output = tmp_path / "results.jsonl"
+    write_lines(topics, ['"ok topic"', '"empty topic"', '"error topic"'])
+
+    first = FakeOrchestrator({"empty topic": "empty", "error topic": "error"})
+    stats = asyncio.run(BatchResearchRunner(first).run(str(topics), str(output)))
+    assert (stats["ok"], stats["empty"], stats["error"], stats["skipped"]) == (1, 1, 1, 0)
+    records = {r["id"]: r for r in map(json.loads, output.read_text(encoding="utf-8").splitlines())}
+    assert records["empty topic"]["status"] == "empty"
+    assert records["empty topic"]["failed_sources"] == [{"source": "https://example.com/a", "error": "timed out"}]
+    assert records["error topic"]["error"] == "search failed"
+
+    second = FakeOrchestrator({})
+    stats = asyncio.run(BatchResearchRunner(second).run(str(topics), str(output)))
+    assert sorted(second.researched) == ["empty topic", "error topic"]
+    assert (stats["ok"], stats["skipped"]) == (2, 1)
+    assert load_completed_ids(str(output)) == {"ok topic", "empty topic", "error topic"}
+
+def test_runner_enables_a_bounded_source_memo(tmp_path):
+    topics = tmp_path / "topics.jsonl"
+    write_lines(topics, ['"alpha"'])
+    orchestrator = FakeOrchestrator({})
+    asyncio.run(BatchResearchRunner(orchestrator).run(str(topics), str(tmp_path / "out.jsonl")))
+    assert orchestrator.source_memo.keep_results
+    assert orchestrator.source_memo.max_results == DEFAULT_MEMO_SOURCES
@@ -0,0 +1,52 @@
+# tests/test_dedup.py
+from tools.dedup import NearDuplicateIndex, hamming, shingles, simhash
+
+TEXT = " ".join(f"word{i % 97} item{i % 13} part{i}" for i in range(120))
+
+def test_shingles_are_lowercased_word_ngrams():
+    assert shingles("The quick brown Fox", size=3) == ["the quick brown", "quick brown fox"]
+    assert shingles("Two words", size=3) == ["two words"]
+    assert shingles("  ", size=3) == []
+
+def test_simhash_is_close_for_near_copies_and_far_for_other_text():
+    copy = TEXT + " Copyright mirror site, all rights reserved."
+    other = " ".join(f"other{i % 31} thing{i}" for i in range(120))
+    assert simhash(TEXT) == simhash(TEXT)
+    assert hamming(simhash(TEXT), simhash(copy)) <= 8
+    assert hamming(simhash(TEXT), simhash(other)) > 8
+    assert simhash("") == 0
+
+def test_index_returns_original_for_near_duplicates():
+    index = NearDuplicateIndex()
+    assert index.add("a", TEXT) is None
+    assert index.add("b", TEXT + " footer") == "a"
+    # Re-adding the same key is not a duplicate of itself
+    assert index.add("a", TEXT) is None
+    assert list(index.fingerprints) == ["a"]
+
+def test_index_never_matches_short_texts():
+    index = NearDuplicateIndex(min_chars=200)
+    assert index.add("a", "short page") is None
+    assert index.add("b", "short page") is None
+    assert index.fingerprints == {}
+
+def test_add_fingerprint_and_discard():
+    index = NearDuplicateIndex()
+    fingerprint = simhash(TEXT)
+    assert index.add_fingerprint("a", fingerprint) is None
+    assert index.add_fingerprint("b", fingerprint) == "a"
+    index.discard("a")
+    index.discard("missing")
+    assert index.add_fingerprint("b", fingerprint) is None
+    assert list(index.fingerprints) == ["b"]
+
+def test_find_prefers_the_best_ranked_match():
+    index = NearDuplicateIndex(max_distance=8)
+    base = simhash(TEXT)
+    # 9 bits apart, so both are indexed; the query is within 8 bits of each
+    assert index.add_fingerprint("late", base, rank=5) is None
+    assert index.add_fingerprint("early", base ^ 0x1FF, rank=1) is None
+    assert index.find(base ^ 0x1F) == "early"
+    index.discard("early")
+    assert index.find(base ^ 0x1F) == "late"
+    assert index.ranks == {"late": 5}
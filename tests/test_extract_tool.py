@@ -0,0 +1,45 @@
+# tests/test_extract_tool.py
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("readability")
+
+from tools.extract_tool import _html_to_text, extract_main_content
+
+ARTICLE = " ".join(f"Sentence {i} of the article explains the runtime in detail." for i in range(12))
+
+def page(body: str, title: str = "Runtime guide") -> str:
+    return f"<html><head><title>{title}</title><style>p {{color: red}}</style></head><body>{body}</body></html>"
+
+def test_boilerplate_is_stripped_and_blocks_become_paragraphs():
+    text = _html_to_text(page(
+        "<nav>Home | About</nav><script>track()</script>"
+        "<h1>Runtime   guide</h1><ul><li><p>First</p> point</li></ul>"
+        "<footer>Copyright</footer>"
+    ))
+    assert text == "Runtime guide\n\nFirst point"
+
+def test_loose_text_in_divs_is_kept_in_document_order():
+    divs = "".join(f"<div>Paragraph {i} text</div>" for i in range(30))
+    text = _html_to_text(page("<p>Intro</p>" + divs + "<div>line one<br>line <b>two</b></div>"))
+    paragraphs = text.split("\n\n")
+    assert paragraphs[:2] == ["Intro", "Paragraph 0 text"]
+    assert paragraphs[-3:] == ["Paragraph 29 text", "line one", "line two"]
+    assert len(paragraphs) == 33
+
+def test_readability_article_is_extracted_without_page_chrome():
+    html = page(
+        "<nav>Home | About | Contact</nav>"
+        "<article>" + "".join(f"<p>{ARTICLE}</p>" for _ in range(3)) + "</article>"
+        "<footer>Copyright footer text</footer>"
+    )
+    result = extract_main_content(html, "https://example.com/guide")
+    assert result["title"] == "Runtime guide"
+    assert ARTICLE in result["text"]
+    assert "Copyright" not in result["text"] and "Contact" not in result["text"]
+
+def test_whole_page_fallback_when_readability_finds_too_little():
+    divs = "".join(f"<div>Paragraph {i} of a page built from divs.</div>" for i in range(30))
+    result = extract_main_content(page("<p>Short intro.</p>" + divs))
+    assert "Paragraph 0 of a page" in result["text"]
+    assert "Paragraph 29 of a page" in result["text"]
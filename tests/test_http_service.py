@@ -0,0 +1,118 @@
+# tests/test_http_service.py
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+from aiohttp.test_utils import TestClient, TestServer
+
+from my_agents.research_events import ResearchCompleted, SearchCompleted
+from service.http_service import ResearchService, create_app
+
+class FakeOrchestrator:
+    """Streams one event per job and finishes when the test releases it."""
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.runs = []
+
+    async def stream_research(self, topic, max_results=3, user_id=None):
+        self.runs.append(topic)
+        yield SearchCompleted(topic, [], 0.0)
+        await self.release.wait()
+        if topic == "broken":
+            raise RuntimeError("search backend down")
+        yield ResearchCompleted(topic, f"report on {topic}")
+
+async def until(condition, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+def serve(test, workers=1, queue_size=10):
+    """Run `test(client, service, orchestrator)` against a live app."""
+    async def main():
+        orchestrator = FakeOrchestrator()
+        service = ResearchService(orchestrator, workers=workers, queue_size=queue_size)
+        async with TestClient(TestServer(create_app(service))) as client:
+            await test(client, service, orchestrator)
+    asyncio.run(main())
+
+def test_identical_topics_share_one_job():
+    async def test(client, service, orchestrator):
+        first = await (await client.post("/research", json={"topic": "Rust async"})).json()
+        second = await (await client.post("/research", json={"topic": "  rust ASYNC "})).json()
+        other = await (await client.post("/research", json={"topic": "Rust async", "max_results": 5})).json()
+        assert first["coalesced"] is False and second["coalesced"] is True
+        assert second["job_id"] == first["job_id"]
+        assert other["job_id"] != first["job_id"]
+        orchestrator.release.set()
+        await until(lambda: service.stats["done"] == 2)
+        assert orchestrator.runs == ["Rust async", "Rust async"]
+        assert service.get_job(first["job_id"]).requests == 2
+
+    serve(test)
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def test(client, service, orchestrator):
+        running = await (await client.post("/research", json={"topic": "one"})).json()
+        await until(lambda: service.get_job(running["job_id"]).status == "running")
+        queued = await client.post("/research", json={"topic": "two"})
+        assert queued.status == 202
+        rejected = await client.post("/research", json={"topic": "three"})
+        assert rejected.status == 429
+        assert int(rejected.headers["Retry-After"]) >= 1
+        assert service.health()["rejected"] == 1
+        orchestrator.release.set()
+
+    serve(test, workers=1, queue_size=1)
+
+def test_job_status_moves_from_queued_to_done_or_failed():
+    async def test(client, service, orchestrator):
+        blocker = await (await client.post("/research", json={"topic": "first"})).json()
+        await until(lambda: service.get_job(blocker["job_id"]).status == "running")
+        ok = await (await client.post("/research", json={"topic": "second"})).json()
+        broken = await (await client.post("/research", json={"topic": "broken"})).json()
+        assert ok["status"] == "queued"
+        assert (await (await client.get(f"/jobs/{ok['job_id']}")).json())["status"] == "queued"
+
+        orchestrator.release.set()
+        await until(lambda: service.get_job(broken["job_id"]).status in ("done", "failed"))
+        job = await (await client.get(f"/jobs/{ok['job_id']}")).json()
+        assert job["status"] == "done"
+        assert job["result"]["output"] == "report on second"
+        assert [e["type"] for e in job["events"]] == ["SearchCompleted"]
+        failed = await (await client.get(f"/jobs/{broken['job_id']}")).json()
+        assert failed["status"] == "failed" and failed["error"] == "search backend down"
+        assert (await client.get("/jobs/unknown")).status == 404
+
+    serve(test)
+
+def test_wait_mode_returns_the_finished_job():
+    async def test(client, service, orchestrator):
+        orchestrator.release.set()
+        job = await (await client.post("/research?wait=1", json={"topic": "Rust async"})).json()
+        assert job["status"] == "done"
+        assert job["result"]["output"] == "report on Rust async"
+
+    serve(test)
+
+def test_bad_requests_are_rejected():
+    async def test(client, service, orchestrator):
+        assert (await client.post("/research", data="not json")).status == 400
+        assert (await client.post("/research", json={"topic": " "})).status == 400
+        assert (await client.post("/research", json={"topic": "x", "max_results": "many"})).status == 400
+
+    serve(test)
+
+def test_shutdown_fails_running_jobs():
+    async def test(client, service, orchestrator):
+        job = await (await client.post("/research", json={"topic": "slow"})).json()
+        await until(lambda: service.get_job(job["job_id"]).status == "running")
+        await service.stop()
+        stopped = service.get_job(job["job_id"])
+        assert stopped.status == "failed" and stopped.error == "Service stopped"
+        assert stopped.done.is_set()
+
+    serve(test)
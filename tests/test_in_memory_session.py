@@ -0,0 +1,62 @@
+# tests/test_in_memory_session.py
+import asyncio
+import time
+
+from session.in_memory_session import InMemorySessionManager
+
+def create(manager: InMemorySessionManager, user_id: str, app_name: str = "default"):
+    return asyncio.run(manager.create_session(user_id, app_name))
+
+def test_messages_are_a_ring_buffer():
+    manager = InMemorySessionManager(max_messages=3)
+    session = create(manager, "u1")
+    for i in range(5):
+        session.add_message(f"m{i}", role="user")
+    assert [m["content"] for m in session.get_history(limit=10)] == ["m2", "m3", "m4"]
+    assert [m["content"] for m in session.get_history(limit=2)] == ["m3", "m4"]
+    assert session.get_history(limit=0) == []
+
+def test_least_recently_used_session_is_evicted_over_the_cap():
+    manager = InMemorySessionManager(max_sessions=2, idle_ttl=None)
+    first = create(manager, "u1")
+    second = create(manager, "u2")
+    # Touch the first session so the second becomes least recently used
+    first.add_message("hello")
+    third = create(manager, "u3")
+
+    assert manager.get_session(second.id) is None
+    assert manager.get_session(first.id) is not None
+    assert manager.get_session(third.id) is not None
+    assert manager.list_user_sessions("u2") == []
+    assert "u2" not in manager.user_sessions
+    assert manager.memory_stats()["evicted_lru"] == 1
+
+def test_idle_sessions_are_evicted():
+    manager = InMemorySessionManager(idle_ttl=60)
+    old = create(manager, "u1")
+    fresh = create(manager, "u2")
+    manager.sessions[old.id].last_access = time.time() - 120
+
+    assert manager.evict_idle() == 1
+    assert manager.get_session(old.id) is None
+    assert manager.get_session(fresh.id) is not None
+    assert manager.memory_stats()["evicted_idle"] == 1
+
+def test_creating_a_session_drops_idle_ones_first():
+    manager = InMemorySessionManager(idle_ttl=60)
+    old = create(manager, "u1")
+    manager.sessions[old.id].last_access = time.time() - 120
+    create(manager, "u1")
+    assert manager.get_session(old.id) is None
+    assert len(manager.list_user_sessions("u1")) == 1
+
+def test_delete_session_cleans_up_the_user_index():
+    manager = InMemorySessionManager()
+    a = create(manager, "u1")
+    b = create(manager, "u1")
+    assert manager.list_user_sessions("u1") == [a.id, b.id]
+    assert manager.delete_session(a.id)
+    assert not manager.delete_session(a.id)
+    assert manager.list_user_sessions("u1") == [b.id]
+    manager.delete_session(b.id)
+    assert manager.user_sessions == {}
@@ -0,0 +1,79 @@
+# tests/test_page_cache.py
+import time
+
+from tools.page_cache import PageCache, normalize_url
+
+def make_cache(tmp_path, **kwargs) -> PageCache:
+    return PageCache(path=str(tmp_path / "pages.sqlite"), **kwargs)
+
+def put_pages(cache: PageCache, *numbers: int, size: int = 100):
+    for n in numbers:
+        cache.put(f"https://example.com/{n}", "x" * size)
+        # Distinct access times keep the LRU order deterministic
+        time.sleep(0.005)
+
+def test_normalize_url_drops_tracking_params_fragment_and_default_port():
+    assert (normalize_url("HTTPS://Example.com:443/a?utm_source=x&b=2&a=1#top")
+            == "https://example.com/a?a=1&b=2")
+
+def test_get_returns_fresh_entry_and_counts_misses(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.get("https://example.com/a") is None
+    cache.put("https://example.com/a", "text", title="A", etag='"v1"')
+    entry = cache.get("https://example.com/a?utm_medium=mail")
+    assert entry["text"] == "text"
+    assert entry["etag"] == '"v1"'
+    assert entry["fresh"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+def test_stale_entry_is_fresh_again_after_revalidation(tmp_path):
+    cache = make_cache(tmp_path, ttl=0.05)
+    cache.put("https://example.com/a", "text", etag='"v1"')
+    time.sleep(0.1)
+    entry = cache.get("https://example.com/a")
+    assert not entry["fresh"]
+    assert entry["etag"] == '"v1"'
+
+    cache.mark_revalidated("https://example.com/a", etag='"v2"')
+    entry = cache.get("https://example.com/a")
+    assert entry["fresh"]
+    assert entry["etag"] == '"v2"'
+    assert entry["text"] == "text"
+    assert cache.stats()["revalidated"] == 1
+
+def test_eviction_drops_least_recently_used_first(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=350, touch_interval=0)
+    put_pages(cache, 1, 2, 3)
+    # Reading 1 makes 2 the least recently used entry
+    assert cache.get("https://example.com/1") is not None
+    put_pages(cache, 4)
+
+    assert cache.get("https://example.com/2") is None
+    for n in (1, 3, 4):
+        assert cache.get(f"https://example.com/{n}") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 300
+
+def test_reads_within_touch_interval_do_not_refresh_lru_order(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=250, touch_interval=3600)
+    put_pages(cache, 1, 2)
+    assert cache.get("https://example.com/1") is not None
+    put_pages(cache, 3)
+    assert cache.get("https://example.com/1") is None
+    assert cache.get("https://example.com/2") is not None
+
+def test_eviction_frees_down_to_low_water_mark(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=1000)
+    put_pages(cache, *range(10))
+    assert cache.stats()["evictions"] == 0
+    put_pages(cache, 10)
+    stats = cache.stats()
+    assert stats["bytes"] <= 900
+    assert stats["evictions"] == 2
+
+def test_put_skips_pages_larger_than_the_cache(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=10)
+    cache.put("https://example.com/big", "x" * 11)
+    assert cache.get("https://example.com/big") is None
@@ -0,0 +1,157 @@
+# tests/test_research_agent.py
+import asyncio
+
+from my_agents.research_agent import ResearchOrchestrator
+from my_agents.worker_agents import SUMMARY_FALLBACK
+from my_agents.research_events import (
+    ComparisonReady, ResearchCompleted, SearchCompleted, SourceDeduplicated, SourceFailed, SourceFetched,
+    SourceSummarized,
+)
+
+PAGE = " ".join(f"word{i % 97} item{i % 13} part{i}" for i in range(120))
+OTHER = " ".join(f"other{i % 31} thing{i}" for i in range(120))
+
+class FakeOrchestrator(ResearchOrchestrator):
+    """Orchestrator with scripted search results, pages and summaries and no model calls."""
+    def __init__(self, pages, fail_summaries=0, fallback_summaries=0, fetch_delay=0.0, delays=None, **kwargs):
+        super().__init__(shared_agents=False, **kwargs)
+        self.pages = pages
+        self.fail_summaries = fail_summaries
+        # Calls answered with SUMMARY_FALLBACK, like a model that returns nothing usable
+        self.fallback_summaries = fallback_summaries
+        self.fetch_delay = fetch_delay
+        # Extra fetch time per URL
+        self.delays = delays or {}
+        self.fetches = []
+        self.summarized = []
+        self.summarizer_agent.run = self._summarize
+
+    async def _search(self, topic, user_id, max_results):
+        return [{"title": url, "link": url, "snippet": ""} for url in topic.split()], True
+
+    async def _fetch_content(self, index, link, user_id):
+        self.fetches.append(link)
+        await asyncio.sleep(self.fetch_delay + index * 0.01 + self.delays.get(link, 0.0))
+        return self.pages[link]
+
+    async def _summarize(self, content, user_id, **call_options):
+        await asyncio.sleep(0.01)
+        if self.fail_summaries:
+            self.fail_summaries -= 1
+            raise RuntimeError("model error")
+        if self.fallback_summaries:
+            self.fallback_summaries -= 1
+            return SUMMARY_FALLBACK
+        self.summarized.append(content)
+        return f"summary of {content[:10]}"
+
+    async def _compare(self, summaries, user_id):
+        return {}
+
+async def collect(orchestrator, topic):
+    return [event async for event in orchestrator.stream_research(topic, max_results=3)]
+
+def completed(events):
+    assert isinstance(events[-1], ResearchCompleted)
+    return events[-1].summaries
+
+def test_near_duplicates_become_aliases():
+    orchestrator = FakeOrchestrator({"https://a.example/": PAGE, "https://b.example/": PAGE + " mirror"})
+    events = asyncio.run(collect(orchestrator, "https://a.example/ https://b.example/"))
+    summaries = completed(events)
+    assert [s["source"] for s in summaries] == ["https://a.example/"]
+    assert summaries[0]["aliases"] == ["https://b.example/"]
+    assert len(orchestrator.summarized) == 1
+    kinds = [type(e) for e in events if isinstance(e, (SourceSummarized, SourceDeduplicated))]
+    assert kinds == [SourceSummarized, SourceDeduplicated]
+
+def test_the_best_ranked_copy_names_the_shared_summary():
+    orchestrator = FakeOrchestrator({"https://a.example/": PAGE, "https://b.example/": PAGE + " mirror"},
+                                    delays={"https://a.example/": 0.1})
+    summaries = completed(asyncio.run(collect(orchestrator, "https://a.example/ https://b.example/")))
+    # The mirror was fetched first and summarized, but the top result keeps the name
+    assert orchestrator.summarized == [PAGE + " mirror"]
+    assert [s["source"] for s in summaries] == ["https://a.example/"]
+    assert summaries[0]["aliases"] == ["https://b.example/"]
+
+def test_duplicate_is_retried_when_its_original_fails():
+    orchestrator = FakeOrchestrator({"https://a.example/": PAGE, "https://b.example/": PAGE + " mirror"},
+                                    fail_summaries=1)
+    events = asyncio.run(collect(orchestrator, "https://a.example/ https://b.example/"))
+    # Never reported as a duplicate of a source that ended up without a summary
+    assert not any(isinstance(e, SourceDeduplicated) for e in events)
+    assert [e.source for e in events if isinstance(e, SourceSummarized)] == ["https://b.example/"]
+    assert [s["source"] for s in completed(events)] == ["https://b.example/"]
+
+def test_memo_hits_are_checked_against_the_current_run():
+    orchestrator = FakeOrchestrator({"https://a.example/": PAGE, "https://b.example/": PAGE + " mirror",
+                                     "https://c.example/": OTHER})
+    orchestrator.enable_source_memo()
+
+    async def main():
+        await collect(orchestrator, "https://a.example/")
+        return await collect(orchestrator, "https://b.example/ https://a.example/ https://c.example/")
+
+    summaries = completed(asyncio.run(main()))
+    # The memoized copy is reused rather than summarizing the fresh one, under the better rank
+    assert [s["source"] for s in summaries] == ["https://b.example/", "https://c.example/"]
+    assert summaries[0]["aliases"] == ["https://a.example/"]
+    assert orchestrator.fetches.count("https://a.example/") == 1
+    assert orchestrator.summarized == [PAGE, OTHER]
+
+def test_runs_sharing_a_fetch_each_get_their_own_events():
+    orchestrator = FakeOrchestrator({"https://a.example/": PAGE}, fetch_delay=0.05)
+    orchestrator.enable_source_memo(keep_results=False)
+
+    async def main():
+        return await asyncio.gather(collect(orchestrator, "https://a.example/"),
+                                    collect(orchestrator, "https://a.example/"))
+
+    for events in asyncio.run(main()):
+        assert [e.source for e in events if isinstance(e, SourceFetched)] == ["https://a.example/"]
+        assert len(completed(events)) == 1
+    assert orchestrator.fetches == ["https://a.example/"]
+    assert len(orchestrator.summarized) == 1
+
+def test_fallback_summaries_fail_the_source_and_are_not_memoized():
+    orchestrator = FakeOrchestrator({"https://a.example/": PAGE}, fallback_summaries=1)
+    orchestrator.enable_source_memo()
+
+    async def main():
+        return (await collect(orchestrator, "https://a.example/"),
+                await collect(orchestrator, "https://a.example/"))
+
+    first, second = asyncio.run(main())
+    assert [e.source for e in first if isinstance(e, SourceFailed)] == ["https://a.example/"]
+    assert completed(first) == []
+    assert [s["source"] for s in completed(second)] == ["https://a.example/"]
+    assert orchestrator.summarized == [PAGE]
+
+THIRD = " ".join(f"third{i % 17} entry{i}" for i in range(120))
+PAGES = {"https://a.example/": PAGE, "https://b.example/": OTHER, "https://c.example/": THIRD}
+TOPIC = "https://a.example/ https://b.example/ https://c.example/"
+
+def test_results_keep_rank_order_when_sources_finish_out_of_order():
+    orchestrator = FakeOrchestrator(PAGES, delays={"https://a.example/": 0.1})
+    events = asyncio.run(collect(orchestrator, TOPIC))
+    assert [s["source"] for s in completed(events)] == ["https://a.example/", "https://b.example/", "https://c.example/"]
+
+def test_a_source_timeout_drops_only_that_source():
+    orchestrator = FakeOrchestrator(PAGES, delays={"https://b.example/": 5.0}, source_timeout=0.2)
+    events = asyncio.run(collect(orchestrator, TOPIC))
+    failed = [e for e in events if isinstance(e, SourceFailed)]
+    assert [e.source for e in failed] == ["https://b.example/"]
+    assert "Timed out" in failed[0].error
+    assert [s["source"] for s in completed(events)] == ["https://a.example/", "https://c.example/"]
+
+def test_stream_research_yields_per_source_events_as_they_complete():
+    orchestrator = FakeOrchestrator(PAGES, delays={"https://a.example/": 0.1})
+    events = asyncio.run(collect(orchestrator, TOPIC))
+    assert isinstance(events[0], SearchCompleted)
+    assert [type(e) for e in events[-2:]] == [ComparisonReady, ResearchCompleted]
+    summarized = [e.source for e in events if isinstance(e, SourceSummarized)]
+    assert summarized == ["https://b.example/", "https://c.example/", "https://a.example/"]
+    for source in summarized:
+        fetched = next(i for i, e in enumerate(events) if isinstance(e, SourceFetched) and e.source == source)
+        done = next(i for i, e in enumerate(events) if isinstance(e, SourceSummarized) and e.source == source)
+        assert fetched < done
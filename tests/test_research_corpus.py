@@ -0,0 +1,121 @@
+# tests/test_research_corpus.py
+import asyncio
+import types
+
+import pytest
+
+from my_agents.research_agent import ResearchOrchestrator
+from my_agents import research_corpus
+from my_agents.research_corpus import ResearchCorpus, query_terms
+from tests.test_research_agent import FakeOrchestrator, OTHER, PAGE, collect
+
+RESULTS = [
+    {"title": "Rust async runtimes", "link": "https://a.example/rust?utm_source=x", "snippet": "tokio and smol"},
+    {"title": "No link"},
+]
+
+@pytest.fixture
+def corpus(tmp_path):
+    return ResearchCorpus(str(tmp_path / "corpus.sqlite"))
+
+def test_query_terms_drop_stopwords_and_repeats():
+    assert query_terms("What is the Rust async runtime vs the rust runtime?") == ["rust", "async", "runtime"]
+
+def test_search_results_are_reused_only_while_fresh(corpus):
+    corpus.record_search("Rust  Async", RESULTS)
+    assert corpus.get_search("rust async", max_age=60) == RESULTS
+    assert corpus.get_search("rust async", max_age=-1) is None
+    assert corpus.get_search("python async", max_age=60) is None
+
+def test_sources_are_returned_once_summarized_and_fresh(corpus):
+    corpus.record_search("rust async", RESULTS)
+    # Registered by the search, but not summarized yet
+    assert corpus.get_source("https://a.example/rust", max_age=60) is None
+    corpus.record_source("https://a.example/rust", "page text", "summary")
+    source = corpus.get_source("https://a.example/rust?utm_source=y", max_age=60)
+    assert source["summary"] == "summary"
+    assert source["title"] == "Rust async runtimes"
+    assert corpus.get_source("https://a.example/rust", max_age=-1) is None
+    assert corpus.stats()["sources"] == 1
+
+def test_retrieve_ranks_by_bm25_and_requires_coverage(corpus):
+    corpus.record_source("https://a.example/", "Tokio is an async runtime for Rust.", "Rust async runtime.")
+    corpus.record_source("https://b.example/", "Async programming in Python.", "Python asyncio.")
+    corpus.record_source("https://c.example/", "Cooking recipes.", "Soup.")
+    matches = corpus.retrieve("rust async runtime", limit=5, max_age=60)
+    assert [m["url"] for m in matches] == ["https://a.example/"]
+    assert matches[0]["coverage"] == 1.0
+    # Sources sharing two of the three terms are dropped at a stricter coverage
+    assert corpus.retrieve("python async runtime", limit=5, max_age=60, min_coverage=0.9) == []
+    assert corpus.retrieve("rust async runtime", limit=5, max_age=-1) == []
+
+def test_retrieve_quotes_fts_syntax(corpus):
+    corpus.record_source("https://a.example/", "Rust NEAR async", "Rust async.")
+    assert corpus.retrieve('rust" OR NEAR(async *', limit=5, max_age=60)[0]["url"] == "https://a.example/"
+    assert corpus.retrieve("the of and", limit=5, max_age=60) == []
+
+def test_seed_mode_only_searches_for_the_open_slots(corpus):
+    corpus.record_source("https://a.example/", PAGE, "Stored summary.")
+    orchestrator = FakeOrchestrator({}, corpus=corpus, corpus_mode="seed")
+    requested = []
+
+    async def search(topic, user_id, num_results, **call_options):
+        requested.append(num_results)
+        return [{"title": "fresh", "link": "https://b.example/", "snippet": ""}]
+
+    orchestrator.search_agent.run = search
+    # FakeOrchestrator scripts _search; run the real one
+    results, searched = asyncio.run(ResearchOrchestrator._search(orchestrator, PAGE.split()[0], "user", 3))
+    assert requested == [2] and searched
+    assert [r["link"] for r in results] == ["https://a.example/", "https://b.example/"]
+
+def test_sources_are_cancelled_when_recording_the_search_fails(corpus):
+    pages = {"https://a.example/": PAGE}
+    orchestrator = FakeOrchestrator(pages, corpus=corpus, fetch_delay=0.05)
+    cancelled = []
+
+    async def broken(topic, results):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("disk full")
+
+    corpus.arecord_search = broken
+    original_fetch = orchestrator._fetch_content
+
+    async def fetch(index, link, user_id):
+        try:
+            return await original_fetch(index, link, user_id)
+        except asyncio.CancelledError:
+            cancelled.append(link)
+            raise
+
+    orchestrator._fetch_content = fetch
+
+    async def main():
+        with pytest.raises(RuntimeError, match="disk full"):
+            await collect(orchestrator, "https://a.example/")
+        # Checked before asyncio.run cancels whatever is left over
+        return list(cancelled)
+
+    assert asyncio.run(main()) == ["https://a.example/"]
+
+def test_reused_search_results_still_expire(corpus, monkeypatch):
+    now = types.SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(research_corpus, "time", types.SimpleNamespace(time=lambda: now.value))
+    day = 24 * 3600
+    pages = {"https://a.example/": PAGE, "https://b.example/": OTHER, "https://c.example/": "Third page."}
+    orchestrator = FakeOrchestrator(pages, corpus=corpus, corpus_max_age=7 * day)
+    # FakeOrchestrator scripts _search; run the real one
+    orchestrator._search = types.MethodType(ResearchOrchestrator._search, orchestrator)
+    searches = []
+
+    async def search(topic, user_id, num_results, **call_options):
+        searches.append(now.value)
+        return [{"title": url, "link": url, "snippet": ""} for url in pages]
+
+    orchestrator.search_agent.run = search
+    for days in (0, 5, 10, 15, 20):
+        now.value = 1_000_000.0 + days * day
+        asyncio.run(collect(orchestrator, "rust async"))
+    # Days 5 and 15 reuse the search from 5 days earlier without recording it again
+    assert len(searches) == 3
+    assert corpus.stats()["topics"] == 3
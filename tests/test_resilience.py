@@ -0,0 +1,205 @@
+# tests/test_resilience.py
+import asyncio
+import time
+
+import pytest
+
+from tools.resilience import (
+    CircuitBreaker, CircuitOpenError, ResilienceLayer, RetryPolicy, TokenBucket, hedged,
+    is_transient_error, retry_async,
+)
+
+NO_DELAY = RetryPolicy(attempts=3, base_delay=0.0, max_delay=0.0)
+
+class StatusError(Exception):
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+def flaky(failures, result="ok"):
+    """Async callable that raises the given exceptions in turn, then returns `result`."""
+    errors = list(failures)
+    calls = []
+
+    async def fn():
+        calls.append(time.monotonic())
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return fn, calls
+
+def test_transient_errors():
+    assert is_transient_error(asyncio.TimeoutError())
+    assert is_transient_error(ConnectionResetError())
+    assert is_transient_error(StatusError(429))
+    assert is_transient_error(StatusError(503))
+    assert not is_transient_error(StatusError(404))
+    assert not is_transient_error(ValueError())
+    assert not is_transient_error(CircuitOpenError("open"))
+
+def test_retry_async_retries_transient_errors_until_success():
+    fn, calls = flaky([StatusError(503), asyncio.TimeoutError()])
+    assert asyncio.run(retry_async(fn, NO_DELAY, "test")) == "ok"
+    assert len(calls) == 3
+
+def test_retry_async_gives_up_after_the_last_attempt():
+    fn, calls = flaky([StatusError(503)] * 3)
+    with pytest.raises(StatusError):
+        asyncio.run(retry_async(fn, NO_DELAY, "test"))
+    assert len(calls) == 3
+
+def test_retry_async_does_not_retry_permanent_errors():
+    fn, calls = flaky([StatusError(404)])
+    with pytest.raises(StatusError):
+        asyncio.run(retry_async(fn, NO_DELAY, "test"))
+    assert len(calls) == 1
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(attempts=10, base_delay=1.0, max_delay=4.0)
+    assert all(0 <= policy.delay(n) <= 4.0 for n in range(10) for _ in range(20))
+
+def test_token_bucket_waits_once_the_burst_is_spent():
+    async def main():
+        bucket = TokenBucket(rate=100, capacity=2)
+        return [await bucket.acquire() for _ in range(3)]
+
+    waits = asyncio.run(main())
+    assert waits[:2] == [0.0, 0.0]
+    assert 0 < waits[2] <= 0.011
+
+def test_breaker_opens_after_threshold_then_closes_after_successful_trial():
+    breaker = CircuitBreaker("host", failure_threshold=2, reset_timeout=0.05)
+    for _ in range(2):
+        assert breaker.before_call() is False
+        breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.before_call() is True
+    # Only one trial at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.before_call() is False
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = CircuitBreaker("host", failure_threshold=1, reset_timeout=0.05)
+    breaker.before_call()
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.before_call() is True
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+def open_layer(reset_timeout: float = 0.05) -> ResilienceLayer:
+    """A layer whose breaker for "host" is open, with no retries or rate limits."""
+    layer = ResilienceLayer(host_rate=0, fetch_retry=RetryPolicy(attempts=1),
+                            breaker_threshold=1, breaker_reset=reset_timeout)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(layer.call_host("host", flaky([asyncio.TimeoutError()])[0]))
+    assert layer.breaker("host").state == "open"
+    return layer
+
+def test_cancelled_trial_does_not_wedge_the_breaker():
+    layer = open_layer()
+    time.sleep(0.06)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def main():
+        # The half-open trial is cancelled by a caller's timeout
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(layer.call_host("host", hang), timeout=0.01)
+        assert layer.breaker("host").state == "open"
+        await asyncio.sleep(0.06)
+        return await layer.call_host("host", flaky([])[0])
+
+    assert asyncio.run(main()) == "ok"
+    assert layer.breaker("host").state == "closed"
+
+def test_cancelled_call_while_closed_is_not_a_failure():
+    layer = ResilienceLayer(host_rate=0, breaker_threshold=1)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(layer.call_host("host", hang), timeout=0.01)
+
+    asyncio.run(main())
+    assert layer.breaker("host").state == "closed"
+
+def test_permanent_errors_do_not_trip_the_breaker():
+    layer = ResilienceLayer(host_rate=0, fetch_retry=RetryPolicy(attempts=1), breaker_threshold=1)
+    with pytest.raises(StatusError):
+        asyncio.run(layer.call_host("host", flaky([StatusError(404)])[0]))
+    assert layer.breaker("host").state == "closed"
+
+def test_hedged_returns_the_first_success_and_cancels_the_other():
+    started = []
+    cancelled = []
+
+    async def fn():
+        n = len(started)
+        started.append(n)
+        try:
+            # The first request is slow, the hedge is fast
+            await asyncio.sleep(1.0 if n == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        return n
+
+    async def main():
+        result = await hedged(fn, delay=0.02, target="test")
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(main()) == 1
+    assert started == [0, 1]
+    assert cancelled == [0]
+
+def test_hedged_skips_the_duplicate_for_fast_calls():
+    fn, calls = flaky([])
+    assert asyncio.run(hedged(fn, delay=1.0, target="test")) == "ok"
+    assert len(calls) == 1
+
+def test_hedged_raises_when_both_attempts_fail():
+    async def fail():
+        await asyncio.sleep(0.02)
+        raise StatusError(503)
+
+    with pytest.raises(StatusError):
+        asyncio.run(hedged(fail, delay=0.01, target="test"))
+
+def test_call_model_holds_the_limiter_per_attempt_not_across_backoff():
+    class FixedDelay(RetryPolicy):
+        def delay(self, attempt: int) -> float:
+            return 0.1
+
+    layer = ResilienceLayer(model_rate=0, model_retry=FixedDelay(attempts=2))
+    limiter = asyncio.Semaphore(1)
+    held_during_backoff = []
+
+    async def main():
+        fn, calls = flaky([StatusError(429)])
+        call = asyncio.ensure_future(layer.call_model("model", "test", fn, limiter=limiter))
+        while not calls:
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.01)
+        # First attempt failed and the call is sleeping before its retry
+        held_during_backoff.append(limiter.locked())
+        result = await call
+        return result, calls
+
+    result, calls = asyncio.run(main())
+    assert result == "ok"
+    assert len(calls) == 2
+    assert held_during_backoff == [False]
@@ -0,0 +1,55 @@
+# tests/test_response_cache.py
+from types import SimpleNamespace
+
+import pytest
+
+from my_agents import response_cache as response_cache_module
+from my_agents.response_cache import ResponseCache
+from my_agents.worker_agents import SummarizerAgent
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(response_cache_module, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = ResponseCache()
+    cache.put("k", "v", ttl=60)
+    clock.value += 59
+    assert cache.get("k") == "v"
+    clock.value += 2
+    assert cache.get("k") is None
+    assert cache.stats()["memory_entries"] == 0
+
+def test_memory_tier_evicts_lru_but_disk_keeps_entries(tmp_path, clock):
+    cache = ResponseCache(max_entries=2, disk_path=str(tmp_path / "responses.sqlite"))
+    cache.put("a", "1", ttl=60)
+    cache.put("b", "2", ttl=60)
+    cache.get("a")
+    cache.put("c", "3", ttl=60)  # "b" is least recently used
+    assert cache.stats()["memory_entries"] == 2
+    assert cache.get("b") == "2"
+    stats = cache.stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+
+def test_disk_tier_is_shared_across_instances_and_expires(tmp_path, clock):
+    path = str(tmp_path / "responses.sqlite")
+    ResponseCache(disk_path=path).put("k", "v", ttl=60, agent="summarizer_agent")
+    other = ResponseCache(disk_path=path)
+    assert other.get("k") == "v"
+    clock.value += 61
+    assert ResponseCache(disk_path=path).get("k") is None
+
+def test_editing_an_agent_instruction_invalidates_its_entries():
+    cache = ResponseCache()
+    agent = SummarizerAgent()
+    key = agent._cache_key("page text", cache)
+    cache.put(key, "old summary", ttl=60)
+    assert cache.get(agent._cache_key("page text", cache)) == "old summary"
+    agent.instruction += "\nAlso list the author."
+    assert agent._cache_key("page text", cache) != key
+    assert cache.get(agent._cache_key("page text", cache)) is None
+    # Agents without a TTL are never cached
+    agent.cache_ttl = None
+    assert agent._cache_key("page text", cache) is None
@@ -0,0 +1,93 @@
+# tests/test_single_flight.py
+import asyncio
+
+import pytest
+
+from my_agents.single_flight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(main())
+    assert calls == 1
+    assert results == ["result"] * 5
+    assert flight.stats == {"executions": 1, "coalesced": 4, "memo_hits": 0}
+    assert not flight.in_flight("k")
+
+def test_without_keep_results_finished_work_runs_again():
+    async def main():
+        flight = SingleFlight()
+        await flight.do("k", lambda: asyncio.sleep(0, "a"))
+        return await flight.do("k", lambda: asyncio.sleep(0, "b"))
+
+    assert asyncio.run(main()) == "b"
+
+def test_memoized_results_are_bounded_lru():
+    async def main():
+        flight = SingleFlight(keep_results=True, max_results=2)
+        for key in ("a", "b"):
+            await flight.do(key, lambda key=key: asyncio.sleep(0, key))
+        # Touching "a" makes "b" the one dropped when "c" arrives
+        assert await flight.do("a", lambda: asyncio.sleep(0, "new a")) == "a"
+        await flight.do("c", lambda: asyncio.sleep(0, "c"))
+        return flight, await flight.do("b", lambda: asyncio.sleep(0, "new b"))
+
+    flight, b = asyncio.run(main())
+    assert b == "new b"
+    assert flight.stats["memo_hits"] == 1
+
+def test_failures_are_shared_but_not_memoized():
+    async def main():
+        flight = SingleFlight(keep_results=True)
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+        retry = await flight.do("k", lambda: asyncio.sleep(0, "ok"))
+        return results, retry
+
+    results, retry = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert retry == "ok"
+
+def test_cancelled_waiter_does_not_cancel_shared_work():
+    async def main():
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        impatient = asyncio.ensure_future(flight.do("k", work))
+        patient = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+        return await patient
+
+    assert asyncio.run(main()) == "done"
+
+def test_get_returns_only_memoized_results():
+    async def main():
+        flight = SingleFlight(keep_results=True)
+        assert flight.get("k") is None
+        await flight.do("k", lambda: asyncio.sleep(0, "v"))
+        return flight
+
+    flight = asyncio.run(main())
+    assert flight.get("k") == "v"
+    assert flight.stats["memo_hits"] == 1
@@ -0,0 +1,39 @@
+# tests/test_text_chunker.py
+from tools.text_chunker import CHARS_PER_TOKEN, estimate_tokens, split_into_chunks
+
+def paragraphs(n: int, size: int) -> str:
+    return "\n\n".join(f"p{i} " + "x" * (size - len(f"p{i} ")) for i in range(n))
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a") == 1
+    assert estimate_tokens("a" * CHARS_PER_TOKEN * 3) == 3
+
+def test_short_text_is_one_chunk():
+    assert split_into_chunks("one\n\ntwo", max_tokens=100) == ["one\n\ntwo"]
+
+def test_whole_paragraphs_are_packed_within_budget():
+    text = paragraphs(10, 100)
+    chunks = split_into_chunks(text, max_tokens=80)  # 320 chars
+    assert all(len(c) <= 320 for c in chunks)
+    # Nothing lost or reordered, and no paragraph is split
+    assert "\n\n".join(chunks) == text
+    assert [len(c.split("\n\n")) for c in chunks] == [3, 3, 3, 1]
+
+def test_oversized_paragraph_splits_on_sentences():
+    sentence = "This sentence is about forty chars long."
+    text = " ".join([sentence] * 10)
+    chunks = split_into_chunks(text, max_tokens=25)  # 100 chars
+    assert all(len(c) <= 100 for c in chunks)
+    assert all(c.endswith(".") for c in chunks)
+    assert " ".join(chunks) == text
+
+def test_run_on_text_is_hard_split():
+    chunks = split_into_chunks("x" * 250, max_tokens=25)
+    assert [len(c) for c in chunks] == [100, 100, 50]
+
+def test_max_chunks_keeps_the_start_of_the_text():
+    chunks = split_into_chunks(paragraphs(10, 100), max_tokens=25, max_chunks=3)
+    assert len(chunks) == 3
+    assert chunks[0].startswith("p0 ")
+    assert chunks[2].startswith("p2 ")
@@ -0,0 +1,88 @@
+# tests/test_tracing.py
+import asyncio
+import contextvars
+
+import pytest
+
+from my_agents.research_agent import ResearchOrchestrator
+from my_agents.research_events import ResearchCompleted, SearchCompleted
+from observability.tracing import Tracer, tracer
+
+def test_nested_spans_share_the_trace_and_record_durations():
+    t = Tracer()
+    with t.span("outer") as outer:
+        with t.span("inner", n=1) as inner:
+            assert t.current_span() is inner
+        assert t.current_span() is outer
+    assert t.current_span() is None
+    assert inner.parent_id == outer.span_id
+    assert inner.trace_id == outer.trace_id
+    assert inner.duration <= outer.duration
+    assert set(t.latency_summary()) == {"outer", "inner"}
+
+def test_span_error_is_recorded_and_reraised():
+    t = Tracer()
+    with pytest.raises(KeyError):
+        with t.span("failing") as span:
+            raise KeyError("x")
+    assert span.status == "error"
+    assert "KeyError" in span.error
+
+def test_closing_a_span_from_another_context_is_not_hidden():
+    t = Tracer()
+    manager = t.span("leaky")
+    manager.__enter__()
+    with pytest.raises(ValueError):
+        contextvars.Context().run(manager.__exit__, None, None, None)
+    # The span is still recorded before the reset fails
+    assert t.latency_summary()["leaky"]["count"] == 1
+
+def test_counters_render_as_prometheus_text():
+    t = Tracer()
+    t.inc("calls_total", agent="a")
+    t.inc("calls_total", 2, agent="a")
+    assert t.counters() == {'calls_total{agent="a"}': 3}
+    assert 'calls_total{agent="a"} 3' in t.prometheus_text()
+
+def test_stream_research_keeps_the_job_span_out_of_the_consumer():
+    orchestrator = ResearchOrchestrator(shared_agents=False)
+
+    async def no_results(topic, user_id, max_results):
+        await asyncio.sleep(0.01)
+        return [], True
+
+    orchestrator._search = no_results
+
+    async def consume():
+        seen = []
+        with tracer.span("consumer") as consumer:
+            async for event in orchestrator.stream_research("topic"):
+                # The consumer's own context is untouched between events
+                assert tracer.current_span() is consumer
+                with tracer.span("consumer.step") as step:
+                    await asyncio.sleep(0.05)
+                seen.append((type(event), step.parent_id))
+        return consumer, seen
+
+    before = tracer.latency_summary().get("research.job", {"count": 0, "sum": 0.0})
+    consumer, seen = asyncio.run(consume())
+    assert [kind for kind, _ in seen] == [SearchCompleted, ResearchCompleted]
+    assert all(parent == consumer.span_id for _, parent in seen)
+    job = tracer.latency_summary()["research.job"]
+    assert job["count"] == before["count"] + 1
+    # 2 x 50ms spent by the consumer are not part of the job
+    assert job["sum"] - before["sum"] < 0.05
+
+def test_stream_research_raises_pipeline_errors_in_the_consumer():
+    orchestrator = ResearchOrchestrator(shared_agents=False)
+
+    async def broken(topic, user_id, max_results):
+        raise RuntimeError("search backend down")
+
+    orchestrator._search = broken
+
+    async def consume():
+        return [event async for event in orchestrator.stream_research("topic")]
+
+    with pytest.raises(RuntimeError, match="search backend down"):
+        asyncio.run(consume())
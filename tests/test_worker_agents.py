@@ -0,0 +1,128 @@
+# tests/test_worker_agents.py
+import asyncio
+
+import pytest
+
+from my_agents.worker_agents import ComparisonAgent, SummarizerAgent, SUMMARY_FALLBACK, parse_comparison_rows
+from observability.tracing import tracer
+
+class ScriptedSummarizer(SummarizerAgent):
+    """SummarizerAgent whose model calls fail for the given chunk numbers."""
+    def __init__(self, failing_parts=()):
+        super().__init__()
+        self.failing_parts = set(failing_parts)
+        self.messages = []
+
+    async def _run(self, message: str, user_id: str = "user_1", **call_options) -> str:
+        self.messages.append(message)
+        if message.startswith("Summarize part "):
+            part = int(message.split()[2])
+            if part in self.failing_parts:
+                raise RuntimeError(f"model error on part {part}")
+            return f"- point from part {part}"
+        return "- merged summary"
+
+def long_text(paragraphs: int = 4) -> str:
+    return "\n\n".join("y" * 900 for _ in range(paragraphs))
+
+def failed_chunks() -> float:
+    return tracer.counters().get('summary_chunks_total{status="failed"}', 0)
+
+def test_map_reduce_merges_all_chunk_summaries():
+    agent = ScriptedSummarizer()
+    summary = asyncio.run(agent.run_map_reduce(long_text(), chunk_tokens=250))
+    assert summary == "- merged summary"
+    assert len(agent.messages) == 5  # 4 chunks + 1 merge
+
+def test_map_reduce_marks_partial_summary_and_counts_failures():
+    before = failed_chunks()
+    agent = ScriptedSummarizer(failing_parts={2, 3})
+    summary = asyncio.run(agent.run_map_reduce(long_text(), chunk_tokens=250))
+    assert summary.startswith("- merged summary")
+    assert "2 of 4 parts" in summary
+    assert failed_chunks() - before == 2
+
+def test_map_reduce_with_one_surviving_chunk_skips_the_merge():
+    agent = ScriptedSummarizer(failing_parts={1, 2, 3})
+    summary = asyncio.run(agent.run_map_reduce(long_text(), chunk_tokens=250))
+    assert summary.startswith("- point from part 4")
+    assert "1 of 4 parts" in summary
+    assert len(agent.messages) == 4
+
+def test_map_reduce_with_no_surviving_chunk_falls_back():
+    agent = ScriptedSummarizer(failing_parts={1, 2, 3, 4})
+    assert asyncio.run(agent.run_map_reduce(long_text(), chunk_tokens=250)) == SUMMARY_FALLBACK
+
+def test_shared_agents_keep_response_cache_per_orchestrator(monkeypatch):
+    from my_agents.research_agent import ResearchOrchestrator
+    from my_agents.response_cache import ResponseCache
+
+    cached = ResearchOrchestrator(response_cache=ResponseCache())
+    plain = ResearchOrchestrator()
+    agent = cached.summarizer_agent
+    assert plain.summarizer_agent is agent
+    calls = []
+
+    async def fake_model(message, user_id):
+        calls.append(message)
+        return "- summary"
+
+    monkeypatch.setattr(agent, "_run_model", fake_model)
+
+    async def summarize(orchestrator):
+        return await agent.run("same page text", "u", **orchestrator._agent_options())
+
+    async def main():
+        await summarize(cached)
+        await summarize(cached)
+        await summarize(plain)
+
+    asyncio.run(main())
+    assert len(calls) == 2  # second cached run is a hit, the plain run never sees the cache
+    assert agent.response_cache is None
+
+def test_parse_comparison_rows_reads_fenced_json_with_list_cells():
+    text = """Here you go:
+```json
+[{"source": "https://a.example/", "summary": "A.", "pros": ["fast", " ", "cheap"], "cons": "slow start"},
+ "not a row",
+ {"source": "https://b.example/", "summary": null}]
+```"""
+    assert parse_comparison_rows(text) == [
+        {"source": "https://a.example/", "summary": "A.", "pros": "fast\ncheap", "cons": "slow start"},
+        {"source": "https://b.example/", "summary": "", "pros": "", "cons": ""},
+    ]
+
+def test_parse_comparison_rows_falls_back_to_a_markdown_table():
+    text = """| Source | Summary | Pros | Cons |
+|:------|---------|------|------|
+| https://a.example/ | A. | fast<br>cheap | slow |
+| too | short |"""
+    assert parse_comparison_rows(text) == [
+        {"source": "https://a.example/", "summary": "A.", "pros": "fast\ncheap", "cons": "slow"},
+    ]
+
+def test_parse_comparison_rows_handles_empty_and_broken_output():
+    assert parse_comparison_rows("") == []
+    assert parse_comparison_rows("[not json") == []
+    assert parse_comparison_rows("no table here") == []
+
+def test_comparison_rows_missing_a_source_get_it_from_the_input(monkeypatch):
+    agent = ComparisonAgent()
+
+    async def fake_run(message, user_id="user_1", **call_options):
+        return '[{"summary": "A."}, {"source": "https://b.example/", "summary": "B."}]'
+
+    monkeypatch.setattr(agent, "_run", fake_run)
+    summaries = [{"source": "https://a.example/", "summary": "a"}, {"source": "https://b.example/", "summary": "b"}]
+    rows = asyncio.run(agent.run(summaries))
+    assert [r["source"] for r in rows] == ["https://a.example/", "https://b.example/"]
+
+def test_fetch_agent_tool_is_awaited_by_the_runner():
+    import inspect
+    pytest.importorskip("aiohttp")
+    from my_agents.worker_agents import FetchAgent
+
+    tools = FetchAgent()._tools()
+    assert all(inspect.iscoroutinefunction(tool) for tool in tools)
+    assert "fetch_url_async" in FetchAgent().instruction
@@ -0,0 +1,144 @@
+# tools/async_fetcher.py
+import asyncio
+import threading
+from typing import Dict, Any, Optional, Awaitable, TypeVar
+
+import aiohttp
+
+T = TypeVar("T")
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; ResearchAgent/1.0)"
+}
+
+class AsyncFetcher:
+    """
+    Pooled, non-blocking HTTP fetcher shared by every caller in the process.
+
+    An aiohttp session is bound to the event loop it was created on, so the
+    fetcher owns a small background loop thread that holds the connection pool
+    (keep-alive, per-host caps, cached DNS). Async callers await results via
+    `fetch`, sync callers (ADK function tools) block only their own thread via
+    `fetch_sync`.
+    """
+    def __init__(self,
+                 limit: int = 100,
+                 limit_per_host: int = 8,
+                 dns_ttl: int = 300,
+                 keepalive_timeout: float = 30.0,
+                 timeout: float = 15.0,
+                 chunk_size: int = 16 * 1024):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="fetch-pool", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Only ever called on the pool loop, so no locking is needed here.
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=DEFAULT_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def _fetch(self, url: str, max_bytes: int, headers: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        session = self._get_session()
+        async with session.get(url, headers=headers, allow_redirects=True) as response:
+            response.raise_for_status()
+
+            # Stream the body and stop as soon as the byte budget is reached
+            body = bytearray()
+            truncated = False
+            async for chunk in response.content.iter_chunked(self.chunk_size):
+                body.extend(chunk)
+                if len(body) >= max_bytes:
+                    truncated = True
+                    break
+
+            charset = response.charset or "utf-8"
+            try:
+                text = bytes(body[:max_bytes]).decode(charset, errors="replace")
+            except LookupError:
+                text = bytes(body[:max_bytes]).decode("utf-8", errors="replace")
+
+            return {
+                "status_code": response.status,
+                "url": str(response.url),
+                "text": text,
+                "bytes": len(body),
+                "truncated": truncated,
+                "content_type": response.headers.get("Content-Type", ""),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+
+    async def fetch(self, url: str, max_bytes: int = 1_000_000,
+                    headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Fetch `url` on the shared pool without blocking the caller's event loop.
+        Raises aiohttp.ClientError / asyncio.TimeoutError on failure.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch(url, max_bytes, headers), self._ensure_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+    def fetch_sync(self, url: str, max_bytes: int = 1_000_000,
+                   headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Blocking variant of `fetch` for synchronous callers."""
+        return self.run_sync(self._fetch(url, max_bytes, headers))
+
+    def run_sync(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the pool loop and block the calling thread for its result."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("run_sync cannot be called from the fetch pool thread")
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def close(self):
+        """Close the connection pool and stop the background loop."""
+        with self._lock:
+            loop, thread, session = self._loop, self._thread, self._session
+            self._loop, self._thread, self._session = None, None, None
+        if loop is None:
+            return
+        if session is not None and not session.closed:
+            asyncio.run_coroutine_threadsafe(session.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+        loop.close()
+
+_default_fetcher: Optional[AsyncFetcher] = None
+_default_lock = threading.Lock()
+
+def get_fetcher() -> AsyncFetcher:
+    """Return the process-wide shared fetcher, creating it on first use."""
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = AsyncFetcher()
+        return _default_fetcher
@@ -0,0 +1,82 @@
+# tools/dedup.py
+import hashlib
+import re
+from typing import Dict, List, Optional
+
+_WORD = re.compile(r"\w+")
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    """Overlapping word n-grams of the lower-cased text."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    64-bit SimHash of the text's word shingles. Texts that share most of
+    their shingles get fingerprints a few bits apart, so mirrored or
+    syndicated copies with different boilerplate still match.
+    """
+    grams = set(shingles(text, shingle_size))
+    if not grams:
+        return 0
+    # Count set bits per position column-wise (one string per hash) instead
+    # of looping over 64 bits in Python for every shingle
+    columns = zip(*(format(_hash64(g), "064b") for g in grams))
+    half = len(grams) / 2
+    fingerprint = 0
+    for column in columns:
+        fingerprint = (fingerprint << 1) | (column.count("1") > half)
+    return fingerprint
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+class NearDuplicateIndex:
+    """
+    SimHash fingerprints of the sources seen in one research run. `add`
+    returns the key of an earlier source within `max_distance` bits (the
+    new text is a near-duplicate of it) or registers the new source. Each
+    source keeps its search rank; when several match, the best-ranked wins.
+    """
+    def __init__(self, max_distance: int = 8, min_chars: int = 200):
+        self.max_distance = max_distance
+        # Shorter texts (error pages, stubs) give unstable fingerprints; never match them
+        self.min_chars = min_chars
+        self.fingerprints: Dict[str, int] = {}
+        self.ranks: Dict[str, int] = {}
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        best = None
+        for key, other in self.fingerprints.items():
+            if hamming(fingerprint, other) > self.max_distance:
+                continue
+            if best is None or self.ranks[key] < self.ranks[best]:
+                best = key
+        return best
+
+    def add(self, key: str, text: str, fingerprint: Optional[int] = None, rank: int = 0) -> Optional[str]:
+        """Return the key `text` duplicates, or None after indexing it under `key`."""
+        if len(text) < self.min_chars:
+            return None
+        if fingerprint is None:
+            fingerprint = simhash(text)
+        return self.add_fingerprint(key, fingerprint, rank)
+
+    def add_fingerprint(self, key: str, fingerprint: int, rank: int = 0) -> Optional[str]:
+        """Like `add` for a fingerprint computed earlier; the caller checks `min_chars`."""
+        original = self.find(fingerprint)
+        if original is not None and original != key:
+            return original
+        self.fingerprints[key] = fingerprint
+        self.ranks[key] = rank
+        return None
+
+    def discard(self, key: str):
+        """Forget `key`, e.g. when its source failed, so its duplicates can stand in for it."""
+        self.fingerprints.pop(key, None)
+        self.ranks.pop(key, None)
@@ -0,0 +1,80 @@
+# tools/extract_tool.py
+from typing import Dict
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from readability import Document
+
+# Elements that never carry article text
+BOILERPLATE_TAGS = ["head", "script", "style", "noscript", "template", "svg", "iframe",
+                    "nav", "header", "footer", "aside", "form", "button"]
+# Elements whose text is emitted as one paragraph
+BLOCK_TAGS = ["p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "pre", "blockquote",
+              "td", "th", "dt", "dd", "figcaption"]
+# Elements that separate loose text (text outside any block element) into paragraphs
+CONTAINER_TAGS = ["body", "div", "section", "article", "main", "table", "tr", "ul", "ol", "dl", "center"]
+# Below this many characters the readability result is treated as a miss
+MIN_ARTICLE_CHARS = 200
+
+def _html_to_text(html: str) -> str:
+    """
+    Strip markup and boilerplate, keeping one paragraph per block element.
+    Loose text sitting directly in <div>-like containers becomes a paragraph
+    per container (or per <br>), in document order with the blocks.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup(BOILERPLATE_TAGS):
+        tag.decompose()
+
+    paragraphs = []
+    loose = []
+    loose_container = None
+
+    def flush():
+        text = " ".join(" ".join(loose).split())
+        if text:
+            paragraphs.append(text)
+        loose.clear()
+
+    for node in soup.descendants:
+        if isinstance(node, Tag):
+            if node.name == "br":
+                flush()
+            # Nested blocks (e.g. <p> inside <li>) are covered by their outermost block
+            elif node.name in BLOCK_TAGS and not node.find_parent(BLOCK_TAGS):
+                flush()
+                text = node.get_text(" ", strip=True)
+                if text:
+                    paragraphs.append(" ".join(text.split()))
+        elif type(node) is NavigableString and not node.find_parent(BLOCK_TAGS):
+            container = node.find_parent(CONTAINER_TAGS)
+            if container is not loose_container:
+                flush()
+                loose_container = container
+            loose.append(node)
+    flush()
+    return "\n\n".join(paragraphs)
+
+def extract_main_content(html: str, url: str = "") -> Dict[str, str]:
+    """
+    Extract the main readable content of an HTML page.
+
+    Uses readability to locate the article body and falls back to the whole
+    page (minus boilerplate) when readability finds too little text.
+
+    Returns:
+        {"title": "page title", "text": "clean paragraph text"}
+    """
+    title = ""
+    text = ""
+    try:
+        doc = Document(html, url=url or None)
+        title = doc.short_title() or ""
+        text = _html_to_text(doc.summary(html_partial=True))
+    except Exception:
+        pass
+
+    if len(text) < MIN_ARTICLE_CHARS:
+        full_text = _html_to_text(html)
+        if len(full_text) > len(text):
+            text = full_text
+    return {"title": title, "text": text}
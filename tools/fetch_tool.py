@@ -1,49 +1,146 @@
 # tools/fetch_tool.py
 
-import requests
-from typing import Dict
+import asyncio
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
 
-def fetch_url(url: str) -> Dict[str, str]:
+import aiohttp
+
+from tools.async_fetcher import get_fetcher
+from tools.extract_tool import extract_main_content
+from tools.page_cache import get_page_cache
+from tools.resilience import get_resilience, CircuitOpenError
+from observability.tracing import tracer
+
+# Truncate to safe length for Gemini context
+MAX_CONTENT_CHARS = 12000
+# Byte budget for pages fetched for local extraction (markup is stripped afterwards)
+MAX_PAGE_BYTES = 2_000_000
+
+def _to_error_result(url: str, e: Exception) -> Dict[str, str]:
+    if isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError)):
+        return {
+            "status": "error",
+            "error_message": f"Failed to fetch {url}: {str(e) or type(e).__name__}"
+        }
+    return {
+        "status": "error",
+        "error_message": f"Unexpected error: {str(e)}"
+    }
+
+def _page_result(url: str, text: str, title: str, cache_status: str) -> Dict[str, Any]:
+    return {
+        "status": "success",
+        "content": text,
+        "title": title or "",
+        "url": url,
+        "length": len(text),
+        "cache": cache_status,
+    }
+
+async def _load_page(url: str) -> Dict[str, Any]:
+    """
+    Return the extracted text of `url`, going through the page cache.
+
+    Fresh cache entries are served without touching the network; stale entries
+    with an ETag/Last-Modified are revalidated with a conditional GET.
+    """
+    cache = get_page_cache()
+    entry: Optional[Dict[str, Any]] = None
+    if cache is not None:
+        entry = await asyncio.to_thread(cache.get, url)
+        if entry is not None and entry["fresh"]:
+            return _page_result(url, entry["text"], entry["title"], "hit")
+
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    # Per-host rate limit, retries, circuit breaker and optional hedging
+    host = urlsplit(url).hostname or ""
+    result = await get_resilience().call_host(
+        host, lambda: get_fetcher().fetch(url, max_bytes=MAX_PAGE_BYTES, headers=headers or None)
+    )
+    tracer.inc("fetch_bytes_total", result["bytes"])
+
+    if result["status_code"] == 304 and entry is not None:
+        await asyncio.to_thread(cache.mark_revalidated, url, result.get("etag"), result.get("last_modified"))
+        return _page_result(url, entry["text"], entry["title"], "revalidated")
+
+    content_type = result.get("content_type", "").lower()
+    if not content_type or "html" in content_type:
+        extracted = await asyncio.to_thread(extract_main_content, result["text"], result["url"])
+    elif content_type.startswith("text/"):
+        extracted = {"title": "", "text": result["text"]}
+    else:
+        return {
+            "status": "error",
+            "error_message": f"Unsupported content type for {url}: {content_type}"
+        }
+
+    tracer.inc("extracted_chars_total", len(extracted["text"]))
+    if cache is not None and extracted["text"].strip():
+        await asyncio.to_thread(
+            cache.put, url, extracted["text"], extracted["title"],
+            result.get("etag"), result.get("last_modified"),
+        )
+    return _page_result(url, extracted["text"], extracted["title"], "miss")
+
+def _truncate_for_model(result: Dict[str, Any]) -> Dict[str, Any]:
+    if result.get("status") == "success" and len(result["content"]) > MAX_CONTENT_CHARS:
+        text = result["content"][:MAX_CONTENT_CHARS] + "\n\n... [Content truncated to fit model limits]"
+        result = dict(result, content=text, length=len(text))
+    return result
+
+async def fetch_page_async(url: str) -> Dict[str, Any]:
+    """
+    Fetch a page and extract its main readable text locally, using the page cache.
+
+    Used by the orchestrator's direct mode instead of routing raw HTML through
+    the FetchAgent model. Extraction is CPU-bound and runs in a worker thread.
+
+    Returns:
+        Success: {"status": "success", "content": "clean text", "title": "...", "url": url,
+                  "length": n, "cache": "hit" | "revalidated" | "miss"}
+        Error:   {"status": "error", "error_message": "..."}
+    """
+    with tracer.span("tool.fetch_page", url=url) as span:
+        try:
+            result = await _load_page(url)
+        except Exception as e:
+            result = _to_error_result(url, e)
+        span.set(status=result["status"], cache=result.get("cache"))
+        tracer.inc("fetch_requests_total", status=result["status"], cache=result.get("cache", "none"))
+        return result
+
+async def fetch_url_async(url: str) -> Dict[str, Any]:
     """
     Fetches the full text content of a webpage from the given URL.
-    
+
     This tool is used by agents to read online articles, blogs, or documentation
     when only a URL is available from search results.
-    
+
     Args:
         url: The complete URL of the webpage to fetch (must include https://)
-    
+
     Returns:
         Dictionary with status and fetched content or error message.
         Success: {"status": "success", "content": "full page text..."}
         Error:   {"status": "error", "error_message": "..."}
     """
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (compatible; ResearchAgent/1.0)"
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        text = response.text
-
-        # Truncate to safe length for Gemini context
-        if len(text) > 12000:
-            text = text[:12000] + "\n\n... [Content truncated to fit model limits]"
+    # Registered as FetchAgent's tool: ADK awaits coroutine tools, so the
+    # fetch (and its retries) never blocks the runner's event loop
+    return _truncate_for_model(await fetch_page_async(url))
 
-        return {
-            "status": "success",
-            "content": text,
-            "url": url,
-            "length": len(text)
-        }
-
-    except requests.RequestException as e:
-        return {
-            "status": "error",
-            "error_message": f"Failed to fetch {url}: {str(e)}"
-        }
+def fetch_url(url: str) -> Dict[str, Any]:
+    """
+    Blocking variant of fetch_url_async for callers outside an event loop.
+    Runs the fetch on the shared fetcher's loop; same return contract.
+    """
+    try:
+        return _truncate_for_model(get_fetcher().run_sync(fetch_page_async(url)))
     except Exception as e:
-        return {
-            "status": "error",
-            "error_message": f"Unexpected error: {str(e)}"
-        }
\ No newline at end of file
+        return _to_error_result(url, e)
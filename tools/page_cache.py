@@ -0,0 +1,212 @@
+# tools/page_cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "pages.sqlite")
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+# LRU order only needs to be roughly right; don't write on every read
+DEFAULT_TOUCH_INTERVAL = 300.0
+# Eviction frees space down to this fraction of max_bytes so the next puts don't evict again
+EVICT_LOW_WATER = 0.9
+
+# Query parameters that never change page content
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT,
+    text TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages(accessed_at);
+"""
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for cache keys: lower-case scheme/host, no default
+    port, no fragment, sorted query without tracking parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+def cache_key(url: str) -> str:
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+class PageCache:
+    """
+    Disk-backed cache of extracted page text, shared by every process that
+    points at the same SQLite file.
+
+    Entries younger than `ttl` are served directly. Older entries keep their
+    ETag/Last-Modified so callers can revalidate with a conditional GET.
+    The total stored text is capped at `max_bytes`, evicting least recently
+    used entries first. A read refreshes an entry's access time at most once
+    per `touch_interval` seconds, and the size total is tracked in memory so
+    puts only scan the table when it goes over the cap. WAL mode plus a busy
+    timeout make concurrent readers and writers from several worker
+    processes safe.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, touch_interval: float = DEFAULT_TOUCH_INTERVAL):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        # Running estimate of the stored bytes. Other processes' writes are not
+        # counted, so it is corrected from the table whenever eviction runs.
+        self._size_lock = threading.Lock()
+        self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads, keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(self, counter: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[counter] = self._stats.get(counter, 0) + n
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a page. Returns None on a miss, otherwise the stored entry with
+        an extra "fresh" flag telling whether it is still within the TTL.
+        """
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT * FROM pages WHERE key = ?", (cache_key(url),)).fetchone()
+        if row is None:
+            self.record("misses")
+            return None
+        if now - row["accessed_at"] >= self.touch_interval:
+            conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, row["key"]))
+        entry = dict(row)
+        entry["fresh"] = now - entry["fetched_at"] < self.ttl
+        self.record("hits" if entry["fresh"] else "stale")
+        return entry
+
+    def put(self, url: str, text: str, title: str = "",
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO pages "
+            "(key, url, title, text, etag, last_modified, fetched_at, accessed_at, size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (cache_key(url), normalize_url(url), title, text, etag, last_modified, now, now, size),
+        )
+        self.record("stores")
+        with self._size_lock:
+            # A replaced entry is counted twice; that only makes eviction check sooner
+            self._total_bytes += size
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self._evict()
+
+    def mark_revalidated(self, url: str, etag: Optional[str] = None,
+                         last_modified: Optional[str] = None):
+        """Reset an entry's TTL after the origin answered 304 Not Modified."""
+        now = time.time()
+        self._conn().execute(
+            "UPDATE pages SET fetched_at = ?, accessed_at = ?, "
+            "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE key = ?",
+            (now, now, etag, last_modified, cache_key(url)),
+        )
+        self.record("revalidated")
+
+    def _evict(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            victims = []
+            if total > self.max_bytes:
+                target = self.max_bytes * EVICT_LOW_WATER
+                # Walks idx_pages_accessed oldest first and stops once enough is freed
+                for row in conn.execute("SELECT key, size FROM pages ORDER BY accessed_at ASC"):
+                    if total <= target:
+                        break
+                    victims.append((row["key"],))
+                    total -= row["size"]
+                conn.executemany("DELETE FROM pages WHERE key = ?", victims)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        with self._size_lock:
+            self._total_bytes = total
+        if victims:
+            self.record("evictions", len(victims))
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this process plus the current on-disk footprint."""
+        entries, total = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+        ).fetchone()
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["hit_rate"] = round((stats["hits"] + stats["revalidated"]) / lookups, 3) if lookups else 0.0
+        stats["entries"] = entries
+        stats["bytes"] = total
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+_default_cache: Optional[PageCache] = None
+_default_lock = threading.Lock()
+
+def get_page_cache() -> Optional[PageCache]:
+    """
+    Process-wide cache configured from the environment:
+    PAGE_CACHE_PATH, PAGE_CACHE_TTL (seconds), PAGE_CACHE_MAX_MB.
+    Set PAGE_CACHE_DISABLED=1 to turn caching off.
+    """
+    global _default_cache
+    if os.environ.get("PAGE_CACHE_DISABLED", "").lower() in ("1", "true", "yes"):
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = PageCache(
+                path=os.environ.get("PAGE_CACHE_PATH", DEFAULT_CACHE_PATH),
+                ttl=float(os.environ.get("PAGE_CACHE_TTL", DEFAULT_TTL)),
+                max_bytes=int(float(os.environ.get("PAGE_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024),
+            )
+        return _default_cache
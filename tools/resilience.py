@@ -0,0 +1,320 @@
+# tools/resilience.py
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from observability.tracing import tracer
+
+T = TypeVar("T")
+
+# HTTP / API status codes worth retrying
+TRANSIENT_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    True for failures that may succeed on retry: timeouts, dropped connections,
+    429 and 5xx responses. Model errors are matched on their `code` attribute
+    (google.genai APIError), HTTP errors on `status` (aiohttp).
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    # aiohttp errors can only exist once aiohttp is loaded; don't import it just to check
+    aiohttp = sys.modules.get("aiohttp")
+    if aiohttp is not None and isinstance(exc, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return True
+    for attr in ("status", "code", "status_code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int) and value in TRANSIENT_STATUS:
+            return True
+    return False
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: `rate` tokens per second, bursts up to
+    `capacity`. Safe to share between event loops on different threads.
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take `tokens` now (possibly going negative) and return how long to wait for them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until `tokens` are available. Returns the seconds spent waiting."""
+        if self.rate <= 0:
+            return 0.0
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+async def retry_async(fn: Callable[[], Awaitable[T]], policy: RetryPolicy, target: str,
+                      is_retryable: Callable[[BaseException], bool] = is_transient_error) -> T:
+    """Call `fn` until it succeeds, fails with a non-retryable error, or attempts run out."""
+    for attempt in range(policy.attempts):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt + 1 >= policy.attempts or not is_retryable(e):
+                raise
+            delay = policy.delay(attempt)
+            tracer.inc("retries_total", target=target, error=type(e).__name__)
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a host whose circuit breaker is open."""
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_timeout` seconds; then lets one trial call through (half-open) and
+    closes again if it succeeds.
+    """
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> bool:
+        """
+        Raise CircuitOpenError if the call must not go through. Returns True
+        when the caller is the half-open trial, which must then end with
+        record_success or record_failure.
+        """
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half_open" and self._trial_in_flight):
+                tracer.inc("circuit_rejected_total", target=self.name)
+                raise CircuitOpenError(f"Circuit open for {self.name}")
+            if state == "half_open":
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            was_trial = self._trial_in_flight
+            self._trial_in_flight = False
+            if was_trial or self.failures >= self.failure_threshold:
+                if self.opened_at is None or was_trial:
+                    tracer.inc("circuit_opened_total", target=self.name)
+                self.opened_at = time.monotonic()
+
+async def hedged(fn: Callable[[], Awaitable[T]], delay: float, target: str) -> T:
+    """
+    Start `fn`; if it has not finished after `delay` seconds start a duplicate
+    and return whichever succeeds first, cancelling the other.
+    """
+    first = asyncio.ensure_future(fn())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+
+    tracer.inc("hedges_fired_total", target=target)
+    second = asyncio.ensure_future(fn())
+    pending = {first, second}
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        tracer.inc("hedges_won_total", target=target)
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+class ResilienceLayer:
+    """
+    Shared limits and policies for model calls and page fetches: token-bucket
+    rate limits per model and per host, jittered retries, a circuit breaker
+    per host and optional hedged fetches (duplicate after the p95 fetch time).
+    """
+    def __init__(self,
+                 model_rate: float = 10.0,
+                 model_burst: float = 20.0,
+                 host_rate: float = 5.0,
+                 host_burst: float = 10.0,
+                 model_retry: Optional[RetryPolicy] = None,
+                 fetch_retry: Optional[RetryPolicy] = None,
+                 breaker_threshold: int = 5,
+                 breaker_reset: float = 30.0,
+                 hedge_fetches: bool = False,
+                 hedge_default_delay: float = 2.0,
+                 hedge_min_delay: float = 0.2):
+        self.model_rate = model_rate
+        self.model_burst = model_burst
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.model_retry = model_retry or RetryPolicy(attempts=4, base_delay=1.0, max_delay=16.0)
+        self.fetch_retry = fetch_retry or RetryPolicy(attempts=3, base_delay=0.5, max_delay=4.0)
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.hedge_fetches = hedge_fetches
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_min_delay = hedge_min_delay
+        self._model_buckets: Dict[str, TokenBucket] = {}
+        self._host_buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def model_limiter(self, model: str) -> TokenBucket:
+        with self._lock:
+            if model not in self._model_buckets:
+                self._model_buckets[model] = TokenBucket(self.model_rate, self.model_burst)
+            return self._model_buckets[model]
+
+    def host_limiter(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._host_buckets:
+                self._host_buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+            return self._host_buckets[host]
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(host, self.breaker_threshold, self.breaker_reset)
+            return self._breakers[host]
+
+    def hedge_delay(self) -> float:
+        """p95 of recent network fetches, or the default until enough samples exist."""
+        p95 = tracer.percentile("http.fetch", 95, min_count=20)
+        if p95 is None:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, p95)
+
+    async def call_model(self, model: str, target: str, fn: Callable[[], Awaitable[T]],
+                         limiter: Optional[asyncio.Semaphore] = None) -> T:
+        """
+        Call the model under its rate limit, retrying transient errors. The
+        optional concurrency `limiter` is held per attempt only, never while
+        waiting for a token or sleeping between retries.
+        """
+        async def attempt() -> T:
+            waited = await self.model_limiter(model).acquire()
+            if waited:
+                tracer.inc("ratelimit_wait_seconds_total", waited, scope="model", key=model)
+            if limiter is None:
+                return await fn()
+            async with limiter:
+                return await fn()
+
+        return await retry_async(attempt, self.model_retry, target)
+
+    async def call_host(self, host: str, fn: Callable[[], Awaitable[T]]) -> T:
+        breaker = self.breaker(host)
+        trial = breaker.before_call()
+
+        async def attempt() -> T:
+            waited = await self.host_limiter(host).acquire()
+            if waited:
+                tracer.inc("ratelimit_wait_seconds_total", waited, scope="host", key=host)
+            start = time.perf_counter()
+            if self.hedge_fetches:
+                result = await hedged(fn, self.hedge_delay(), target=host)
+            else:
+                result = await fn()
+            tracer.observe("http.fetch", time.perf_counter() - start)
+            return result
+
+        try:
+            result = await retry_async(attempt, self.fetch_retry, f"fetch:{host}")
+        except Exception as e:
+            # A 404 or similar still proves the host is up; only transient errors trip the breaker
+            if is_transient_error(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except BaseException:
+            # Cancelled (source timeout, aclose(), ...). An unfinished trial counts
+            # as failed, otherwise the breaker would wait for it forever.
+            if trial:
+                breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
+
+_default_layer: Optional[ResilienceLayer] = None
+_default_lock = threading.Lock()
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+def get_resilience() -> ResilienceLayer:
+    """
+    Process-wide resilience layer configured from the environment:
+    MODEL_RATE_LIMIT / MODEL_RATE_BURST (calls/s per model),
+    HOST_RATE_LIMIT / HOST_RATE_BURST (requests/s per host),
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS, HEDGE_FETCHES=1.
+    """
+    global _default_layer
+    with _default_lock:
+        if _default_layer is None:
+            _default_layer = ResilienceLayer(
+                model_rate=_env_float("MODEL_RATE_LIMIT", 10.0),
+                model_burst=_env_float("MODEL_RATE_BURST", 20.0),
+                host_rate=_env_float("HOST_RATE_LIMIT", 5.0),
+                host_burst=_env_float("HOST_RATE_BURST", 10.0),
+                breaker_threshold=int(_env_float("CIRCUIT_FAILURE_THRESHOLD", 5)),
+                breaker_reset=_env_float("CIRCUIT_RESET_SECONDS", 30.0),
+                hedge_fetches=os.environ.get("HEDGE_FETCHES", "").lower() in ("1", "true", "yes"),
+            )
+        return _default_layer
+
+def set_resilience(layer: ResilienceLayer):
+    """Replace the process-wide layer (e.g. with custom limits in benchmarks)."""
+    global _default_layer
+    with _default_lock:
+        _default_layer = layer
@@ -0,0 +1,65 @@
+# tools/text_chunker.py
+import re
+from typing import List, Optional
+
+# Rough heuristic for English prose with Gemini tokenizers
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def _split_oversized(paragraph: str, max_chars: int) -> List[str]:
+    """Split one paragraph that exceeds the budget, preferring sentence boundaries."""
+    pieces: List[str] = []
+    current = ""
+    for sentence in re.split(r"(?<=[.!?])\s+", paragraph):
+        while len(sentence) > max_chars:
+            # A single run-on "sentence" longer than the budget: hard split
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+def split_into_chunks(text: str, max_tokens: int = 2500, max_chunks: Optional[int] = None) -> List[str]:
+    """
+    Split text into chunks of at most `max_tokens` (estimated), packing whole
+    paragraphs together and only breaking inside a paragraph when it is larger
+    than the budget on its own.
+
+    Args:
+        text: Text with paragraphs separated by blank lines.
+        max_tokens: Token budget per chunk.
+        max_chunks: Keep at most this many chunks (from the start of the text).
+    """
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    for paragraph in paragraphs:
+        parts = [paragraph] if len(paragraph) <= max_chars else _split_oversized(paragraph, max_chars)
+        for part in parts:
+            # +2 accounts for the blank line joining paragraphs
+            if current and current_len + 2 + len(part) > max_chars:
+                chunks.append("\n\n".join(current))
+                current, current_len = [], 0
+            current.append(part)
+            current_len += len(part) + (2 if current_len else 0)
+        if max_chunks and len(chunks) >= max_chunks:
+            break
+    if current:
+        chunks.append("\n\n".join(current))
+
+    if max_chunks:
+        chunks = chunks[:max_chunks]
+    return chunks